@@ -0,0 +1,58 @@
+import numpy as np
+
+EPSILON = 1e-9
+
+def build_matrix(constraints):
+    cells = sorted({cell for cells, _ in constraints for cell in cells})
+    column = {cell: j for j, cell in enumerate(cells)}
+
+    matrix = np.zeros((len(constraints), len(cells) + 1))
+    for i, (constraint_cells, count) in enumerate(constraints):
+        matrix[i, [column[cell] for cell in constraint_cells]] = 1.0
+        matrix[i, -1] = count
+    return cells, matrix
+
+def reduced_row_echelon(matrix):
+    matrix = matrix.copy()
+    rows, cols = matrix.shape
+    pivot_row = 0
+    for col in range(cols - 1):
+        if pivot_row == rows:
+            break
+        candidate = pivot_row + np.argmax(np.abs(matrix[pivot_row:, col]))
+        if abs(matrix[candidate, col]) < EPSILON:
+            continue
+        matrix[[pivot_row, candidate]] = matrix[[candidate, pivot_row]]
+        matrix[pivot_row] /= matrix[pivot_row, col]
+
+        # Elimina la columna en todas las demás filas a la vez
+        factors = matrix[:, col].copy()
+        factors[pivot_row] = 0.0
+        matrix -= np.outer(factors, matrix[pivot_row])
+        pivot_row += 1
+
+    matrix[np.abs(matrix) < EPSILON] = 0.0
+    return matrix[:pivot_row]
+
+def infer_mines_and_safes(constraints):
+    constraints = [(cells, count) for cells, count in constraints if cells]
+    if not constraints:
+        return set(), set()
+
+    cells, matrix = build_matrix(constraints)
+    reduced = reduced_row_echelon(matrix)
+    coefficients = reduced[:, :-1]
+    totals = reduced[:, -1]
+
+    # Con variables 0/1 cada fila vale entre la suma de sus coeficientes negativos y la de los positivos
+    positive = np.where(coefficients > 0, coefficients, 0.0)
+    negative = np.where(coefficients < 0, coefficients, 0.0)
+    at_max = np.abs(totals - positive.sum(axis=1)) < EPSILON
+    at_min = np.abs(totals - negative.sum(axis=1)) < EPSILON
+
+    mined = ((coefficients > 0) & at_max[:, None]) | ((coefficients < 0) & at_min[:, None])
+    safe = ((coefficients < 0) & at_max[:, None]) | ((coefficients > 0) & at_min[:, None])
+
+    mines = {cells[j] for j in np.flatnonzero(mined.any(axis=0))}
+    safes = {cells[j] for j in np.flatnonzero(safe.any(axis=0))}
+    return mines, safes - mines
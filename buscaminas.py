@@ -1,8 +1,12 @@
 import pygame
-import random
 import time
 import sys
-import copy
+
+# Sentence y Cell se definían en este archivo; se siguen importando desde aquí por compatibilidad
+from ia import Sentence, MinesweeperAI
+from motor import MAX_BOARD_SIZE, PRESETS, Cell, MinesweeperGame
+from repeticion import GameLog
+from trabajador import AIWorker
 
 pygame.init()
 
@@ -12,6 +16,10 @@ MENU_HEIGHT = 0
 INFO_HEIGHT = 100 
 BUTTON_HEIGHT = 45
 BUTTON_WIDTH = 300
+AI_FRAME_BUDGET = 0.010
+# Celdas visibles como máximo; los tableros más grandes se recorren con las flechas o la rueda del ratón
+VIEW_ROWS = 20
+VIEW_COLS = 30
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -42,155 +50,10 @@ NUMBER_COLORS = {
     8: GRAY
 }
 
-class Cell:
+class Minesweeper(MinesweeperGame):
     def __init__(self):
-        self.is_mine = False
-        self.is_revealed = False
-        self.is_flagged = False
-        self.adjacent_mines = 0
-
-class Sentence():
-
-    def __init__(self, cells, count):
-        self.cells = set(cells)
-        self.count = count
-
-    def __eq__(self, other):
-        return self.cells == other.cells and self.count == other.count
-
-    def __str__(self):
-        return f"{self.cells} = {self.count}"
-
-    def identified_mines(self):
-        if self.count == len(self.cells):
-            return self.cells.copy()
-        return set()
-
-    def identified_safes(self):
-        if self.count == 0:
-            return self.cells.copy()
-        return set()
-
-    def mark_cell_as_mine(self, cell):
-        if cell in self.cells:
-            self.cells.remove(cell)
-            self.count = self.count - 1
-
-    def mark_cell_as_safe(self, cell):
-        if cell in self.cells:
-            self.cells.remove(cell)
-
-class MinesweeperAI():
-    def __init__(self, height=8, width=8):
-        self.height = height
-        self.width = width
-
-        self.moves_made = set()
-
-        self.mines = set()
-        self.safes = set()
-
-        self.knowledge = []
-
-    def mark_cell_as_mine(self, cell):
-        self.mines.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_cell_as_mine(cell)
-
-    def mark_cell_as_safe(self, cell):
-        self.safes.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_cell_as_safe(cell)
-
-    def add_knowledge(self, cell, count):
-        self.moves_made.add(cell)
-
-        self.mark_cell_as_safe(cell)
-
-        neighbors = set()
-        for i in range(cell[0] - 1, cell[0] + 2):
-            for j in range(cell[1] - 1, cell[1] + 2):
-                if (i, j) == cell:
-                    continue
-                if 0 <= i < self.height and 0 <= j < self.width:
-                    neighbors.add((i, j))
-
-        cells = set()
-        count_cpy = copy.deepcopy(count)
-
-        for cl in neighbors:
-            if cl in self.mines:
-                count_cpy -= 1
-            if cl not in self.mines | self.safes:
-                cells.add(cl)
-
-        new_sentence = Sentence(cells, count_cpy)
-        if new_sentence not in self.knowledge and len(new_sentence.cells) > 0:
-            self.knowledge.append(new_sentence)
-
-        self.update_knowledge()
-
-        self.create_derived_sentences()
-
-    def create_derived_sentences(self):
-        new_sentences = []
-        for s1 in self.knowledge:
-            for s2 in self.knowledge:
-                if s1 != s2 and s1.cells and s2.cells:
-                    if s1.cells.issubset(s2.cells):
-                        new_cells = s2.cells - s1.cells
-                        new_count = s2.count - s1.count
-                        if new_cells and new_count >= 0:
-                            new_sentence = Sentence(new_cells, new_count)
-                            if new_sentence not in self.knowledge:
-                                new_sentences.append(new_sentence)
-
-        self.knowledge.extend(new_sentences)
+        super().__init__()
 
-        self.update_knowledge()
-
-    def update_knowledge(self):
-        changed = True
-        while changed:
-            changed = False
-
-            identified_mines = set()
-            identified_safes = set()
-
-            for sentence in self.knowledge:
-                identified_mines |= sentence.identified_mines()
-                identified_safes |= sentence.identified_safes()
-
-            for mine in identified_mines:
-                if mine not in self.mines:
-                    self.mark_cell_as_mine(mine)
-                    changed = True
-
-            for safe in identified_safes:
-                if safe not in self.safes:
-                    self.mark_cell_as_safe(safe)
-                    changed = True
-
-            self.knowledge = [s for s in self.knowledge if s.cells]
-
-    def get_next_safe_move(self):
-        for move in self.safes - self.moves_made:
-            return move
-        return None
-
-    def select_random_available_cell(self):
-        options = [
-            (i, j)
-            for i in range(self.height)
-            for j in range(self.width)
-            if (i, j) not in self.moves_made and (i, j) not in self.mines
-        ]
-        if options:
-            return random.choice(options)
-        return None
-
-class Minesweeper:
-    def __init__(self):
         self.font = pygame.font.Font(None, 24)
         self.title_font = pygame.font.Font(None, 48)
         self.button_font = pygame.font.Font(None, 28)
@@ -200,8 +63,13 @@ class Minesweeper:
         self.ai = None
         self.ai_mode = False
         self.ai_speed = 1.0
+        self.ai_turbo = False
+        self.ai_profile = False
         self.last_ai_move_time = 0
         self.ai_thinking = False
+        self.ai_worker = AIWorker()
+        self.ai_pending_move = None
+        self.ai_stats = None
         
         self.show_menu = True
         self.custom_mode = False
@@ -211,102 +79,29 @@ class Minesweeper:
         self.input_active = None
         self.selected_difficulty = 0
         
+        # Caché de renderizado: sprites de celdas, fondos por tamaño y superficie del tablero
+        self.cell_sprites = None
+        self.background_cache = {}
+        self.info_background_cache = {}
+        self.board_surface = None
+        self.board_keys = None
+        self.frame_signature = None
+        self.view_row = 0
+        self.view_col = 0
+        self.saved_replay = None
+        self.saved_replay_until = 0
+        
+        # Cada partida se graba para poder guardarla como repetición con la tecla G
+        self.start_recording(GameLog())
         self.reset_game()
         
     def reset_game(self):
-        self.rows = 9
-        self.cols = 9
-        self.total_mines = 10
-        self.grid = []
-        self.game_over = False
-        self.game_won = False
-        self.first_click = True
-        self.start_time = None
-        self.elapsed_time = 0
-        self.mines_flagged = 0
-        self.cells_revealed = 0
-        self.create_empty_grid()
+        self.rows, self.cols, self.total_mines = PRESETS["principiante"]
+        self.reset_game_state()
         
         if self.ai:
-            self.ai = MinesweeperAI(self.rows, self.cols)
-        
-    def create_empty_grid(self):
-        self.grid = [[Cell() for _ in range(self.cols)] for _ in range(self.rows)]
-        
-    def create_game_grid(self):
-        self.grid = [[Cell() for _ in range(self.cols)] for _ in range(self.rows)]
+            self.create_ai()
         
-    def place_mines(self, first_click_row, first_click_col):
-        mines_placed = 0
-        while mines_placed < self.total_mines:
-            row = random.randint(0, self.rows - 1)
-            col = random.randint(0, self.cols - 1)
-            
-            if (row == first_click_row and col == first_click_col) or self.grid[row][col].is_mine:
-                continue
-                
-            self.grid[row][col].is_mine = True
-            mines_placed += 1
-            
-        self.calculate_adjacent_mines()
-        
-    def calculate_adjacent_mines(self):
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if not self.grid[row][col].is_mine:
-                    count = 0
-                    for dr in [-1, 0, 1]:
-                        for dc in [-1, 0, 1]:
-                            if dr == 0 and dc == 0:
-                                continue
-                            new_row, new_col = row + dr, col + dc
-                            if (0 <= new_row < self.rows and 0 <= new_col < self.cols and 
-                                self.grid[new_row][new_col].is_mine):
-                                count += 1
-                    self.grid[row][col].adjacent_mines = count
-                    
-    def reveal_cell(self, row, col):
-        if (row < 0 or row >= self.rows or col < 0 or col >= self.cols or 
-            self.grid[row][col].is_revealed or self.grid[row][col].is_flagged):
-            return
-            
-        self.grid[row][col].is_revealed = True
-        self.cells_revealed += 1
-        
-        if self.ai and not self.grid[row][col].is_mine:
-            self.ai.add_knowledge((row, col), self.grid[row][col].adjacent_mines)
-        
-        if self.grid[row][col].is_mine:
-            self.game_over = True
-            for r in range(self.rows):
-                for c in range(self.cols):
-                    if self.grid[r][c].is_mine:
-                        self.grid[r][c].is_revealed = True
-            return
-            
-        if self.grid[row][col].adjacent_mines == 0:
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    if dr == 0 and dc == 0:
-                        continue
-                    self.reveal_cell(row + dr, col + dc)
-                    
-    def toggle_flag(self, row, col):
-        if self.grid[row][col].is_revealed:
-            return
-            
-        if self.grid[row][col].is_flagged:
-            self.grid[row][col].is_flagged = False
-            self.mines_flagged -= 1
-        else:
-            self.grid[row][col].is_flagged = True
-            self.mines_flagged += 1
-            
-    def check_win(self):
-        cells_to_reveal = self.rows * self.cols - self.total_mines
-        if self.cells_revealed >= cells_to_reveal:
-            self.game_won = True
-            
     def handle_click(self, pos, right_click=False):
         if self.show_menu:
             return
@@ -315,7 +110,8 @@ class Minesweeper:
             return
             
         game_start_y = MENU_HEIGHT + INFO_HEIGHT + 10  
-        game_start_x = (pygame.display.get_surface().get_width() - (self.cols * (CELL_SIZE + 1) - 1)) // 2
+        view_rows, view_cols = self.view_size()
+        game_start_x = (pygame.display.get_surface().get_width() - (view_cols * (CELL_SIZE + 1) - 1)) // 2
         
         if (pos[1] < game_start_y or pos[0] < game_start_x):
             return
@@ -323,14 +119,14 @@ class Minesweeper:
         adjusted_x = pos[0] - game_start_x
         adjusted_y = pos[1] - game_start_y
         
-        grid_width = self.cols * (CELL_SIZE + 1) - 1
-        grid_height = self.rows * (CELL_SIZE + 1) - 1
+        grid_width = view_cols * (CELL_SIZE + 1) - 1
+        grid_height = view_rows * (CELL_SIZE + 1) - 1
         
         if adjusted_x < 0 or adjusted_x >= grid_width or adjusted_y < 0 or adjusted_y >= grid_height:
             return
             
-        col = adjusted_x // (CELL_SIZE + 1)
-        row = adjusted_y // (CELL_SIZE + 1)
+        col = self.view_col + adjusted_x // (CELL_SIZE + 1)
+        row = self.view_row + adjusted_y // (CELL_SIZE + 1)
         
         if row >= self.rows or col >= self.cols or row < 0 or col < 0 or self.game_over or self.game_won:
             return
@@ -339,65 +135,123 @@ class Minesweeper:
             self.toggle_flag(row, col)
         else:
             if self.first_click:
-                self.create_game_grid()
-                self.place_mines(row, col)
-                self.first_click = False
-                self.start_time = time.time()
+                self.start_game(row, col)
                 
             self.reveal_cell(row, col)
             
         self.check_win()
         
+    def create_ai(self):
+        self.ai_worker.cancel()
+        self.ai_pending_move = None
+        self.ai_thinking = False
+        self.ai = MinesweeperAI(self.rows, self.cols, total_mines=self.total_mines, profile=self.ai_profile)
+        self.ai_stats = self.ai.summary()
+        
     def ai_make_move(self):
         if not self.ai or self.game_over or self.game_won:
             return
             
+        # La inferencia corre en el hilo de la IA; aquí solo se recogen y aplican sus jugadas
+        response = self.ai_worker.poll()
+        if response:
+            move, guess, self.ai_stats = response
+            self.ai_pending_move = (move, guess)
+        self.ai_thinking = self.ai_worker.busy
+            
         current_time = time.time()
         
+        if self.ai_turbo:
+            self.ai_turbo_moves()
+            return
+            
         if current_time - self.last_ai_move_time < (1.0 / self.ai_speed):
             return
             
-        self.ai_thinking = True
-        
         if self.first_click:
-            row, col = self.rows // 2, self.cols // 2
-            self.create_game_grid()
-            self.place_mines(row, col)
-            self.first_click = False
-            self.start_time = time.time()
-            self.reveal_cell(row, col)
-            self.last_ai_move_time = current_time
-            self.ai_thinking = False
+            move, revealed = self.ai_first_move()
+        elif self.ai_pending_move:
+            move, guess = self.ai_pending_move
+            self.ai_pending_move = None
+            if move is None:
+                return
+            revealed = self.apply_ai_move(move, guess, feed=False)
+        elif not self.ai_worker.busy:
+            # IA activada a mitad de partida: se le entrega lo que ya está revelado
+            revealed = self.revealed_cells()
+            self.ai_worker.submit(self.ai, self.observations(revealed))
+            self.ai_thinking = True
             return
-            
-        safe_move = self.ai.get_next_safe_move()
-        if safe_move:
-            row, col = safe_move
-            self.reveal_cell(row, col)
         else:
-            random_move = self.ai.select_random_available_cell()
-            if random_move:
-                row, col = random_move
-                self.reveal_cell(row, col)
-            else:
-                self.ai_thinking = False
-                return
-                
-        for mine_pos in self.ai.mines:
-            mine_row, mine_col = mine_pos
-            if (0 <= mine_row < self.rows and 0 <= mine_col < self.cols and 
-                not self.grid[mine_row][mine_col].is_revealed):
-                self.grid[mine_row][mine_col].is_flagged = True
-                
-        self.check_win()
+            return
+            
         self.last_ai_move_time = current_time
-        self.ai_thinking = False
+        if not self.game_over and not self.game_won:
+            self.ai_worker.submit(self.ai, self.observations(revealed))
+            self.ai_thinking = True
+        
+    def ai_turbo_moves(self):
+        if self.ai_worker.busy:
+            return
+            
+        frame_start = time.perf_counter()
+        if self.first_click:
+            _, revealed = self.ai_first_move()
+        else:
+            revealed = []
+            if self.ai_pending_move:
+                move, guess = self.ai_pending_move
+                self.ai_pending_move = None
+                if move is not None:
+                    revealed += self.apply_ai_move(move, guess, feed=False)
+                    
+            # Las seguras conocidas se juegan en este cuadro mientras alcance el tiempo. Se sacan de la cola
+            # de la IA una por una: el hilo de trabajo está libre y las que no se alcancen quedan para el siguiente
+            while not self.game_over and not self.game_won and time.perf_counter() - frame_start <= AI_FRAME_BUDGET:
+                cell = self.ai.pop_safe_move()
+                if cell is None:
+                    break
+                if not self.grid[cell[0]][cell[1]].is_revealed:
+                    revealed += self.apply_ai_move(cell, False, feed=False)
+                    
+        self.last_ai_move_time = time.time()
+        if not self.game_over and not self.game_won:
+            self.ai_worker.submit(self.ai, self.observations(revealed))
+            self.ai_thinking = True
+            
+    def solve_to_completion(self):
+        if not self.ai_mode:
+            self.toggle_ai_mode()
+        if self.game_over or self.game_won:
+            return
+            
+        # Se parte de una IA nueva: la anterior puede seguir ocupada en el hilo de trabajo
+        self.create_ai()
+        if not self.first_click:
+            revealed = self.revealed_cells()
+            self.ai.add_knowledge_many(self.observations(revealed))
+        while not self.game_over and not self.game_won:
+            if self.ai_step() is None:
+                break
+        self.ai_stats = self.ai.summary()
+        
+    def save_replay(self):
+        if self.first_click:
+            return None
+        path = time.strftime("partida-%Y%m%d-%H%M%S.bmr")
+        self.log.save(path)
+        # Aviso temporal en la línea de estado del panel de información
+        self.saved_replay = path
+        self.saved_replay_until = time.time() + 3
+        return path
         
     def toggle_ai_mode(self):
         self.ai_mode = not self.ai_mode
         if self.ai_mode:
-            self.ai = MinesweeperAI(self.rows, self.cols)
+            self.create_ai()
         else:
+            self.ai_worker.cancel()
+            self.ai_thinking = False
             self.ai = None
             
     def draw_menu(self, screen):
@@ -462,8 +316,8 @@ class Minesweeper:
             screen.blit(panel_title, title_rect)
             
             fields = [
-                ("Filas (2-30):", self.custom_rows, "rows"),
-                ("Columnas (2-30):", self.custom_cols, "cols"),
+                (f"Filas (2-{MAX_BOARD_SIZE}):", self.custom_rows, "rows"),
+                (f"Columnas (2-{MAX_BOARD_SIZE}):", self.custom_cols, "cols"),
                 ("Minas (1-{}):", self.custom_mines, "mines")
             ]
             
@@ -514,15 +368,15 @@ class Minesweeper:
         return button_rects, start_button
         
     def set_beginner(self):
-        self.rows, self.cols, self.total_mines = 9, 9, 10
+        self.rows, self.cols, self.total_mines = PRESETS["principiante"]
         self.selected_difficulty = 0
         
     def set_intermediate(self):
-        self.rows, self.cols, self.total_mines = 16, 16, 40
+        self.rows, self.cols, self.total_mines = PRESETS["intermedio"]
         self.selected_difficulty = 1
         
     def set_expert(self):
-        self.rows, self.cols, self.total_mines = 16, 30, 99
+        self.rows, self.cols, self.total_mines = PRESETS["experto"]
         self.selected_difficulty = 2
         
     def toggle_custom_mode(self):
@@ -531,8 +385,8 @@ class Minesweeper:
             self.selected_difficulty = 3
         
     def apply_custom_settings(self):
-        self.rows = max(2, min(30, self.custom_rows))
-        self.cols = max(2, min(30, self.custom_cols))
+        self.rows = max(2, min(MAX_BOARD_SIZE, self.custom_rows))
+        self.cols = max(2, min(MAX_BOARD_SIZE, self.custom_cols))
         max_mines = (self.rows * self.cols) - 1
         self.total_mines = max(1, min(max_mines, self.custom_mines))
         
@@ -546,10 +400,7 @@ class Minesweeper:
             
         info_rect = pygame.Rect(0, MENU_HEIGHT, screen.get_width(), INFO_HEIGHT)
         
-        for y in range(INFO_HEIGHT):
-            alpha = int(255 * (1 - y / INFO_HEIGHT * 0.3))
-            color = (alpha, alpha, min(255, alpha + 20))
-            pygame.draw.line(screen, color, (0, MENU_HEIGHT + y), (screen.get_width(), MENU_HEIGHT + y))
+        screen.blit(self.get_info_background(screen.get_width()), info_rect)
         
         pygame.draw.rect(screen, BLACK, info_rect, 3)
         pygame.draw.line(screen, WHITE, (5, MENU_HEIGHT + 5), (screen.get_width() - 5, MENU_HEIGHT + 5), 2)
@@ -620,6 +471,15 @@ class Minesweeper:
                 status_text = "Jugando..."
                 color = BLUE
             
+        if self.saved_replay and time.time() < self.saved_replay_until:
+            status_text = "Repetición guardada"
+            color = GREEN
+            path_surface = self.small_font.render(self.saved_replay, True, BLACK)
+            path_rect = path_surface.get_rect()
+            path_rect.centerx = center_x + section_width // 2
+            path_rect.y = info_y + 50
+            screen.blit(path_surface, path_rect)
+            
         status_surface = self.info_font.render(status_text, True, color)
         status_rect = status_surface.get_rect()
         status_rect.centerx = center_x + section_width // 2
@@ -649,7 +509,7 @@ class Minesweeper:
             self.draw_gradient_button(screen, speed_slow, "-", YELLOW, BLACK)
             self.draw_gradient_button(screen, speed_fast, "+", PINK, BLACK)
             
-            speed_text = f"x{self.ai_speed:.1f}"
+            speed_text = "TURBO" if self.ai_turbo else f"x{self.ai_speed:.1f}"
             speed_surface = self.small_font.render(speed_text, True, BLACK)
             screen.blit(speed_surface, (right_x + 10, info_y + 65))
             
@@ -678,100 +538,185 @@ class Minesweeper:
         text_rect = text_surface.get_rect(center=rect.center)
         screen.blit(text_surface, text_rect)
         
-    def draw_grid(self, screen):
+    def get_background(self, size):
+        if size not in self.background_cache:
+            background = pygame.Surface(size)
+            width, height = size
+            for y in range(height):
+                progress = y / height
+                color_value = int(200 + 55 * progress)
+                blue_value = int(255 - 50 * progress)
+                color = (color_value, color_value, blue_value)
+                pygame.draw.line(background, color, (0, y), (width, y))
+            self.background_cache[size] = background.convert()
+        return self.background_cache[size]
+        
+    def get_info_background(self, width):
+        if width not in self.info_background_cache:
+            background = pygame.Surface((width, INFO_HEIGHT))
+            for y in range(INFO_HEIGHT):
+                alpha = int(255 * (1 - y / INFO_HEIGHT * 0.3))
+                color = (alpha, alpha, min(255, alpha + 20))
+                pygame.draw.line(background, color, (0, y), (width, y))
+            self.info_background_cache[width] = background.convert()
+        return self.info_background_cache[width]
+        
+    def create_cell_sprites(self):
+        sprites = {}
+        rect = pygame.Rect(0, 0, CELL_SIZE, CELL_SIZE)
+        
+        hidden = pygame.Surface((CELL_SIZE, CELL_SIZE))
+        hidden.fill(GRAY)
+        pygame.draw.line(hidden, WHITE, (0, 0), (CELL_SIZE - 1, 0), 2)
+        pygame.draw.line(hidden, WHITE, (0, 0), (0, CELL_SIZE - 1), 2)
+        pygame.draw.line(hidden, DARK_GRAY, (CELL_SIZE - 1, 0), (CELL_SIZE - 1, CELL_SIZE - 1), 2)
+        pygame.draw.line(hidden, DARK_GRAY, (0, CELL_SIZE - 1), (CELL_SIZE - 1, CELL_SIZE - 1), 2)
+        sprites["hidden"] = hidden
+        
+        flagged = hidden.copy()
+        flag_points = [
+            (CELL_SIZE//4, CELL_SIZE//6),
+            (3*CELL_SIZE//4, CELL_SIZE//3),
+            (3*CELL_SIZE//4, 2*CELL_SIZE//3),
+            (CELL_SIZE//4, CELL_SIZE//2)
+        ]
+        pygame.draw.polygon(flagged, RED, flag_points)
+        pygame.draw.line(flagged, BLACK, (CELL_SIZE//4, CELL_SIZE//6), (CELL_SIZE//4, 5*CELL_SIZE//6), 3)
+        sprites["flagged"] = flagged
+        
+        for number in range(9):
+            revealed = pygame.Surface((CELL_SIZE, CELL_SIZE))
+            revealed.fill(WHITE)
+            if number > 0:
+                text = self.font.render(str(number), True, NUMBER_COLORS.get(number, BLACK))
+                revealed.blit(text, text.get_rect(center=rect.center))
+            sprites[number] = revealed
+            
+        for key, exploded in (("mine", False), ("exploded", True)):
+            mine = pygame.Surface((CELL_SIZE, CELL_SIZE))
+            if exploded:
+                mine.fill(RED)
+                pygame.draw.circle(mine, YELLOW, rect.center, CELL_SIZE//4)
+            else:
+                mine.fill(WHITE)
+            pygame.draw.circle(mine, BLACK, rect.center, CELL_SIZE//3)
+            pygame.draw.circle(mine, WHITE, (rect.centerx - 3, rect.centery - 3), 3)
+            sprites[key] = mine
+            
+        for sprite in sprites.values():
+            pygame.draw.rect(sprite, BLACK, rect, 1)
+        return {key: sprite.convert() for key, sprite in sprites.items()}
+        
+    def cell_sprite_key(self, cell):
+        if cell.is_revealed:
+            if cell.is_mine:
+                return "exploded" if self.game_over else "mine"
+            return cell.adjacent_mines
+        return "flagged" if cell.is_flagged else "hidden"
+        
+    def view_size(self):
+        return min(self.rows, VIEW_ROWS), min(self.cols, VIEW_COLS)
+        
+    def scroll_view(self, d_row, d_col):
+        view_rows, view_cols = self.view_size()
+        row = max(0, min(self.rows - view_rows, self.view_row + d_row))
+        col = max(0, min(self.cols - view_cols, self.view_col + d_col))
+        if (row, col) != (self.view_row, self.view_col):
+            self.view_row, self.view_col = row, col
+            # Todas las celdas visibles cambiaron
+            self.board_keys = None
+        
+    def draw_grid(self, screen, full=True):
+        # Solo se dibuja la ventana visible del tablero, que empieza en (view_row, view_col)
+        self.scroll_view(0, 0)
+        view_rows, view_cols = self.view_size()
         game_start_y = MENU_HEIGHT + INFO_HEIGHT + 10 
-        game_start_x = (screen.get_width() - (self.cols * (CELL_SIZE + 1) - 1)) // 2
-        
-        board_rect = pygame.Rect(game_start_x - 10, game_start_y - 10, 
-                                self.cols * (CELL_SIZE + 1) + 19, 
-                                self.rows * (CELL_SIZE + 1) + 19)
-        shadow_rect = board_rect.copy()
-        shadow_rect.x += 5
-        shadow_rect.y += 5
-        pygame.draw.rect(screen, DARK_GRAY, shadow_rect)
-        pygame.draw.rect(screen, WHITE, board_rect)
-        pygame.draw.rect(screen, BLACK, board_rect, 3)
-        
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell = self.grid[row][col]
-                x = game_start_x + col * (CELL_SIZE + 1)
-                y = game_start_y + row * (CELL_SIZE + 1)
-                
-                rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
+        game_start_x = (screen.get_width() - (view_cols * (CELL_SIZE + 1) - 1)) // 2
+        board_size = (view_cols * (CELL_SIZE + 1) - 1, view_rows * (CELL_SIZE + 1) - 1)
+        
+        if self.cell_sprites is None:
+            self.cell_sprites = self.create_cell_sprites()
+        if self.board_surface is None or self.board_surface.get_size() != board_size:
+            self.board_surface = pygame.Surface(board_size).convert()
+            self.board_surface.fill(WHITE)
+            self.board_keys = None
+        if self.board_keys is None or len(self.board_keys) != view_rows or len(self.board_keys[0]) != view_cols:
+            self.board_keys = [[None] * view_cols for _ in range(view_rows)]
+            
+        # Solo se vuelven a pintar las celdas cuyo aspecto cambió desde el cuadro anterior
+        dirty = []
+        for row in range(view_rows):
+            keys = self.board_keys[row]
+            cells = self.grid[self.view_row + row]
+            for col in range(view_cols):
+                key = self.cell_sprite_key(cells[self.view_col + col])
+                if key == keys[col]:
+                    continue
+                keys[col] = key
+                x = col * (CELL_SIZE + 1)
+                y = row * (CELL_SIZE + 1)
+                self.board_surface.blit(self.cell_sprites[key], (x, y))
+                dirty.append(pygame.Rect(game_start_x + x, game_start_y + y, CELL_SIZE, CELL_SIZE))
                 
-                if cell.is_revealed:
-                    if cell.is_mine:
-                        if self.game_over:
-                            pygame.draw.rect(screen, RED, rect)
-                            pygame.draw.circle(screen, YELLOW, rect.center, CELL_SIZE//4)
-                        else:
-                            pygame.draw.rect(screen, WHITE, rect)
-                        pygame.draw.circle(screen, BLACK, rect.center, CELL_SIZE//3)
-                        pygame.draw.circle(screen, WHITE, (rect.centerx - 3, rect.centery - 3), 3)
-                    else:
-                        pygame.draw.rect(screen, WHITE, rect)
-                        if cell.adjacent_mines > 0:
-                            color = NUMBER_COLORS.get(cell.adjacent_mines, BLACK)
-                            number = self.font.render(str(cell.adjacent_mines), True, color)
-                            number_rect = number.get_rect(center=rect.center)
-                            screen.blit(number, number_rect)
-                else:
-                    pygame.draw.rect(screen, GRAY, rect)
-                    pygame.draw.line(screen, WHITE, (x, y), (x + CELL_SIZE - 1, y), 2)
-                    pygame.draw.line(screen, WHITE, (x, y), (x, y + CELL_SIZE - 1), 2)
-                    pygame.draw.line(screen, DARK_GRAY, (x + CELL_SIZE - 1, y), (x + CELL_SIZE - 1, y + CELL_SIZE - 1), 2)
-                    pygame.draw.line(screen, DARK_GRAY, (x, y + CELL_SIZE - 1), (x + CELL_SIZE - 1, y + CELL_SIZE - 1), 2)
-                    
-                    if cell.is_flagged:
-                        flag_points = [
-                            (x + CELL_SIZE//4, y + CELL_SIZE//6),
-                            (x + 3*CELL_SIZE//4, y + CELL_SIZE//3),
-                            (x + 3*CELL_SIZE//4, y + 2*CELL_SIZE//3),
-                            (x + CELL_SIZE//4, y + CELL_SIZE//2)
-                        ]
-                        pygame.draw.polygon(screen, RED, flag_points)
-                        pygame.draw.line(screen, BLACK, 
-                                       (x + CELL_SIZE//4, y + CELL_SIZE//6), 
-                                       (x + CELL_SIZE//4, y + 5*CELL_SIZE//6), 3)
-                        
-                pygame.draw.rect(screen, BLACK, rect, 1)
+        if full:
+            board_rect = pygame.Rect(game_start_x - 10, game_start_y - 10, 
+                                    view_cols * (CELL_SIZE + 1) + 19, 
+                                    view_rows * (CELL_SIZE + 1) + 19)
+            shadow_rect = board_rect.copy()
+            shadow_rect.x += 5
+            shadow_rect.y += 5
+            pygame.draw.rect(screen, DARK_GRAY, shadow_rect)
+            pygame.draw.rect(screen, WHITE, board_rect)
+            pygame.draw.rect(screen, BLACK, board_rect, 3)
+            screen.blit(self.board_surface, (game_start_x, game_start_y))
+            dirty = [shadow_rect.union(board_rect)]
+        else:
+            for rect in dirty:
+                screen.blit(self.board_surface, rect, rect.move(-game_start_x, -game_start_y))
         
         if self.ai_mode and self.ai:
-            ai_info_y = game_start_y + self.rows * (CELL_SIZE + 1) + 20
+            ai_info_y = game_start_y + view_rows * (CELL_SIZE + 1) + 20
             
-            ai_panel_height = 50
+            # Con el perfil activo, sus medidas van en dos líneas más
+            ai_panel_height = 84 if self.ai_profile else 50
             ai_panel = pygame.Rect(game_start_x, ai_info_y, 
-                                  self.cols * (CELL_SIZE + 1) - 1, ai_panel_height)
+                                  view_cols * (CELL_SIZE + 1) - 1, ai_panel_height)
             pygame.draw.rect(screen, (240, 248, 255), ai_panel)  
             pygame.draw.rect(screen, BLUE, ai_panel, 2)
+            # En tableros angostos el texto se recorta al panel en lugar de pintarse sobre el fondo
+            screen.set_clip(ai_panel)
             
-            safe_count = len(self.ai.safes - self.ai.moves_made)
-            mine_count = len(self.ai.mines)
-            knowledge_count = len(self.ai.knowledge)
+            safe_count = self.ai_stats["safes"]
+            mine_count = self.ai_stats["mines"]
+            knowledge_count = self.ai_stats["knowledge"]
             
             ai_info = f"IA: {safe_count} seguras | {mine_count} minas | {knowledge_count} reglas"
             ai_info_surface = self.small_font.render(ai_info, True, NAVY)
             screen.blit(ai_info_surface, (ai_panel.x + 10, ai_panel.y + 8))
             
             # Velocidad y estado
-            status_info = f"Velocidad: {self.ai_speed:.1f}x | Estado: {'Pensando...' if self.ai_thinking else 'Activa'}"
+            speed_info = "turbo" if self.ai_turbo else f"{self.ai_speed:.1f}x"
+            status_info = f"Velocidad: {speed_info} | Estado: {'Pensando...' if self.ai_thinking else 'Activa'}"
             status_surface = self.small_font.render(status_info, True, NAVY)
             screen.blit(status_surface, (ai_panel.x + 10, ai_panel.y + 25))
+            
+            if self.ai_profile and "peak" in self.ai_stats:
+                profile_lines = [f"Perfil: {self.ai_stats['add_ms']:.1f} ms/jugada | pico {self.ai_stats['peak']}",
+                                 f"{self.ai_stats['freed_kb']:.0f} KB liberados"]
+                for i, line in enumerate(profile_lines):
+                    line_surface = self.small_font.render(line, True, NAVY)
+                    screen.blit(line_surface, (ai_panel.x + 10, ai_panel.y + 42 + 17 * i))
+            screen.set_clip(None)
+            dirty.append(ai_panel)
+            
+        return dirty
                 
     def restart_game(self):
-        self.game_over = False
-        self.game_won = False
-        self.first_click = True
-        self.start_time = None
-        self.elapsed_time = 0
-        self.mines_flagged = 0
-        self.cells_revealed = 0
-        self.create_empty_grid()
+        self.reset_game_state()
         
         # Reset AI
         if self.ai:
-            self.ai = MinesweeperAI(self.rows, self.cols)
+            self.create_ai()
                 
     def handle_menu_click(self, pos, button_rects, start_button):
         for i, rect in enumerate(button_rects):
@@ -792,7 +737,7 @@ class Minesweeper:
             self.show_menu = False
             self.reset_game_state()
             if self.ai_mode:
-                self.ai = MinesweeperAI(self.rows, self.cols)
+                self.create_ai()
             return
             
         if self.custom_mode:
@@ -822,11 +767,11 @@ class Minesweeper:
             digit = int(event.unicode)
             if self.input_active == "rows":
                 new_value = self.custom_rows * 10 + digit
-                if new_value <= 30:
+                if new_value <= MAX_BOARD_SIZE:
                     self.custom_rows = new_value
             elif self.input_active == "cols":
                 new_value = self.custom_cols * 10 + digit
-                if new_value <= 30:
+                if new_value <= MAX_BOARD_SIZE:
                     self.custom_cols = new_value
             elif self.input_active == "mines":
                 max_mines = (max(2, self.custom_rows) * max(2, self.custom_cols)) - 1
@@ -835,22 +780,13 @@ class Minesweeper:
                     self.custom_mines = max(1, new_value)
 
                     
-    def reset_game_state(self):
-        self.game_over = False
-        self.game_won = False
-        self.first_click = True
-        self.start_time = None
-        self.elapsed_time = 0
-        self.mines_flagged = 0
-        self.cells_revealed = 0
-        self.create_empty_grid()
-        
     def calculate_window_size(self):
         min_width = 800
         min_height = 600
         
-        board_width = self.cols * (CELL_SIZE + 1) + 100 
-        board_height = self.rows * (CELL_SIZE + 1) + MENU_HEIGHT + INFO_HEIGHT + 120
+        view_rows, view_cols = self.view_size()
+        board_width = view_cols * (CELL_SIZE + 1) + 100 
+        board_height = view_rows * (CELL_SIZE + 1) + MENU_HEIGHT + INFO_HEIGHT + 120
         
         if self.ai_mode:
             board_height += 70
@@ -891,10 +827,14 @@ class Minesweeper:
                                 self.ai_speed = max(0.1, self.ai_speed - 0.5)
                             elif speed_buttons[1].collidepoint(event.pos):  
                                 self.ai_speed = min(5.0, self.ai_speed + 0.5)
-                        else:
+                        elif event.button in (1, 3):
                             right_click = event.button == 3
                             self.handle_click(event.pos, right_click)
                             
+                elif event.type == pygame.MOUSEWHEEL:
+                    if not self.show_menu:
+                        self.scroll_view(-3 * event.y, 3 * event.x)
+                            
                 elif event.type == pygame.KEYDOWN:
                     if self.show_menu:
                         self.handle_key_input(event)
@@ -904,6 +844,28 @@ class Minesweeper:
                         self.show_menu = True
                         screen = pygame.display.set_mode((900, 700))
                         self.toggle_ai_mode()
+                    elif event.key == pygame.K_t:
+                        self.ai_turbo = not self.ai_turbo
+                    elif event.key == pygame.K_s:
+                        self.solve_to_completion()
+                    elif event.key in (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT):
+                        # Con Mayús se avanza una pantalla completa
+                        view_rows, view_cols = self.view_size()
+                        step_rows, step_cols = (view_rows, view_cols) if event.mod & pygame.KMOD_SHIFT else (1, 1)
+                        if event.key == pygame.K_UP:
+                            self.scroll_view(-step_rows, 0)
+                        elif event.key == pygame.K_DOWN:
+                            self.scroll_view(step_rows, 0)
+                        elif event.key == pygame.K_LEFT:
+                            self.scroll_view(0, -step_cols)
+                        else:
+                            self.scroll_view(0, step_cols)
+                    elif event.key == pygame.K_g:
+                        self.save_replay()
+                    elif event.key == pygame.K_p:
+                        self.ai_profile = not self.ai_profile
+                        if self.ai_mode:
+                            self.create_ai()
                     elif event.key == pygame.K_PLUS or event.key == pygame.K_KP_PLUS: 
                         self.ai_speed = min(5.0, self.ai_speed + 0.5)
                     elif event.key == pygame.K_MINUS or event.key == pygame.K_KP_MINUS:  
@@ -914,6 +876,8 @@ class Minesweeper:
                     
             if self.show_menu:
                 button_rects, start_button = self.draw_menu(screen)
+                self.frame_signature = None
+                pygame.display.flip()
             else:
                 needed_width, needed_height = self.calculate_window_size()
                 current_size = (screen.get_width(), screen.get_height())
@@ -922,17 +886,23 @@ class Minesweeper:
                 if current_size != needed_size:
                     screen = pygame.display.set_mode(needed_size)
                     
-                for y in range(screen.get_height()):
-                    progress = y / screen.get_height()
-                    color_value = int(200 + 55 * progress)
-                    blue_value = int(255 - 50 * progress)
-                    color = (color_value, color_value, blue_value)
-                    pygame.draw.line(screen, color, (0, y), (screen.get_width(), y))
-                
-                menu_button, restart_button, ai_button, speed_buttons = self.draw_info(screen)
-                self.draw_grid(screen)
+                background = self.get_background(needed_size)
+                signature = (needed_size, self.rows, self.cols, self.ai_mode, self.ai_profile)
+                if signature != self.frame_signature:
+                    # Cambió la distribución de la ventana: se pinta todo una vez
+                    self.frame_signature = signature
+                    self.board_keys = None
+                    screen.blit(background, (0, 0))
+                    menu_button, restart_button, ai_button, speed_buttons = self.draw_info(screen)
+                    self.draw_grid(screen)
+                    pygame.display.flip()
+                else:
+                    info_area = pygame.Rect(0, MENU_HEIGHT, screen.get_width(), INFO_HEIGHT + 5)
+                    screen.blit(background, info_area, info_area)
+                    menu_button, restart_button, ai_button, speed_buttons = self.draw_info(screen)
+                    dirty = [info_area] + self.draw_grid(screen, full=False)
+                    pygame.display.update(dirty)
                     
-            pygame.display.flip()
             clock.tick(60)
             
         pygame.quit()
@@ -940,4 +910,4 @@ class Minesweeper:
 
 if __name__ == "__main__":
     game = Minesweeper()
-    game.run()
\ No newline at end of file
+    game.run()
\ No newline at end of file
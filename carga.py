@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import json
+import time
+
+from servidor import LINE_LIMIT
+from simulador import add_board_arguments, board_from_args
+from torneo import percentile
+
+class Client:
+    def __init__(self, reader, writer, latencies):
+        self.reader = reader
+        self.writer = writer
+        # Operación -> segundos de cada solicitud, desde el envío hasta leer la respuesta
+        self.latencies = latencies
+
+    async def request(self, op, **fields):
+        start = time.perf_counter()
+        self.writer.write(json.dumps(dict(fields, op=op)).encode() + b"\n")
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("El servidor cerró la conexión")
+        self.latencies.setdefault(op, []).append(time.perf_counter() - start)
+
+        response = json.loads(line)
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response
+
+    async def play(self, rows, cols, mines, seed):
+        # El bot sigue las pistas del servidor hasta ganar o pisar una mina
+        game = (await self.request("new", rows=rows, cols=cols, mines=mines, seed=seed))["game"]
+        while True:
+            hint = await self.request("hint", game=game)
+            result = await self.request("reveal", game=game, row=hint["row"], col=hint["col"])
+            if result["over"] or result["won"]:
+                break
+        await self.request("close", game=game)
+        return result["won"]
+
+async def connect(host, port, unix):
+    if unix:
+        return await asyncio.open_unix_connection(unix, limit=LINE_LIMIT)
+    return await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+
+async def run_load(rows, cols, mines, games, seed=0, clients=16, host="127.0.0.1", port=8765, unix=None):
+    seeds = iter(range(seed, seed + games))
+    latencies = {}
+    wins = 0
+
+    async def worker():
+        nonlocal wins
+        reader, writer = await connect(host, port, unix)
+        client = Client(reader, writer, latencies)
+        try:
+            # Las conexiones toman semillas de un iterador compartido hasta agotarlo
+            for game_seed in seeds:
+                won = await client.play(rows, cols, mines, game_seed)
+                wins += won
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(clients)])
+    return wins, time.perf_counter() - start, latencies
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generador de carga para servidor.py: partidas/s y latencias")
+    add_board_arguments(parser)
+    parser.add_argument("--clientes", type=int, default=16, help="Conexiones simultáneas")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--unix", help="Conectarse a este socket Unix en lugar de TCP")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    rows, cols, mines = board_from_args(args)
+    wins, elapsed, latencies = asyncio.run(run_load(rows, cols, mines, args.partidas, args.semilla, args.clientes,
+                                                    args.host, args.puerto, args.unix))
+
+    print(f"Tablero: {rows}x{cols}, {mines} minas | Clientes: {args.clientes}")
+    print(f"Partidas: {args.partidas} | Victorias: {wins} ({100 * wins / max(1, args.partidas):.1f}%)")
+    print(f"Tiempo: {elapsed:.2f}s ({args.partidas / max(elapsed, 1e-9):.1f} partidas/s)")
+    for op, values in sorted(latencies.items()):
+        print(f"{op:>8}: {len(values):7d} solicitudes | p50 {1000 * percentile(values, 50):8.3f}ms "
+              f"p99 {1000 * percentile(values, 99):8.3f}ms | máx {1000 * max(values):8.3f}ms")
+
+if __name__ == "__main__":
+    main()
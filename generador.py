@@ -0,0 +1,29 @@
+import numpy as np
+
+def sample_mines(rng, batch, rows, cols, mines, safe_cell=None):
+    # Una clave aleatoria por celda; las "mines" claves menores son las minas (muestreo sin reemplazo)
+    keys = rng.random((batch, rows * cols))
+    if safe_cell is not None:
+        keys[:, safe_cell[0] * cols + safe_cell[1]] = np.inf
+    chosen = np.argpartition(keys, mines - 1, axis=1)[:, :mines]
+
+    board = np.zeros((batch, rows * cols), dtype=bool)
+    np.put_along_axis(board, chosen, True, axis=1)
+    return board.reshape(batch, rows, cols)
+
+def adjacent_counts(mines):
+    # Suma de los 8 desplazamientos del tablero rodeado por un borde sin minas
+    padded = np.pad(mines.astype(np.uint8), [(0, 0)] * (mines.ndim - 2) + [(1, 1), (1, 1)])
+    rows, cols = mines.shape[-2:]
+    counts = np.zeros(mines.shape, dtype=np.uint8)
+    for dr in (0, 1, 2):
+        for dc in (0, 1, 2):
+            if dr == 1 and dc == 1:
+                continue
+            counts += padded[..., dr:dr + rows, dc:dc + cols]
+    return counts
+
+def generate_boards(batch, rows, cols, mines, seed=None, safe_cell=None):
+    rng = np.random.default_rng(seed)
+    board = sample_mines(rng, batch, rows, cols, mines, safe_cell)
+    return board, adjacent_counts(board)
@@ -0,0 +1,786 @@
+import heapq
+import random
+import sys
+import time
+from array import array
+from collections import OrderedDict
+
+from probabilidad import BudgetExceeded, mine_probabilities
+from restricciones import deduce
+from motor import neighbor_table
+from patrones import MINE, OFF_BOARD, RADIUS, SAFE, SIZE, UNKNOWN
+from perfil import SolverProfile
+
+if hasattr(int, "bit_count"):
+    popcount = int.bit_count
+else:
+    def popcount(mask):
+        return bin(mask).count("1")
+
+class Sentence():
+    __slots__ = ("cells", "count")
+
+    def __init__(self, cells, count):
+        self.cells = set(cells)
+        self.count = count
+
+    def __eq__(self, other):
+        return self.cells == other.cells and self.count == other.count
+
+    def __str__(self):
+        return f"{self.cells} = {self.count}"
+
+    def identified_mines(self):
+        if self.count == len(self.cells):
+            return self.cells.copy()
+        return set()
+
+    def identified_safes(self):
+        if self.count == 0:
+            return self.cells.copy()
+        return set()
+
+    def mark_cell_as_mine(self, cell):
+        if cell in self.cells:
+            self.cells.remove(cell)
+            self.count = self.count - 1
+
+    def mark_cell_as_safe(self, cell):
+        if cell in self.cells:
+            self.cells.remove(cell)
+
+    def key(self):
+        return frozenset(self.cells), self.count
+
+    def size(self):
+        return len(self.cells)
+
+    def members(self):
+        return self.cells
+
+    def is_proper_subset(self, other):
+        return self.cells < other.cells
+
+    def difference(self, other):
+        return Sentence(self.cells - other.cells, self.count - other.count)
+
+    def memory(self):
+        return sys.getsizeof(self) + sys.getsizeof(self.cells)
+
+class BitSentence():
+    __slots__ = ("mask", "offset", "count", "width")
+
+    # Las celdas se guardan como bits de un entero, relativos a la primera celda de la sentencia: la celda
+    # (i, j) es el bit i * width + j - offset. El ancho de la máscara depende de lo que abarca la sentencia
+    # y no de su posición en el tablero, que en un tablero grande llegaría a cientos de miles de bits
+    def __init__(self, mask, count, width, offset=0):
+        self.mask = mask
+        self.offset = offset
+        self.count = count
+        self.width = width
+        self.normalize()
+
+    def normalize(self):
+        # La primera celda queda en el bit 0, así cada conjunto de celdas tiene una sola máscara
+        mask = self.mask
+        if not mask:
+            self.offset = 0
+            return
+        low = (mask & -mask).bit_length() - 1
+        if low:
+            self.mask = mask >> low
+            self.offset += low
+
+    @classmethod
+    def from_cells(cls, cells, count, width):
+        bits = [i * width + j for i, j in cells]
+        offset = min(bits, default=0)
+        mask = 0
+        for bit in bits:
+            mask |= 1 << (bit - offset)
+        return cls(mask, count, width, offset)
+
+    @property
+    def cells(self):
+        return set(self.decode())
+
+    def __eq__(self, other):
+        return self.mask == other.mask and self.offset == other.offset and self.count == other.count
+
+    def __str__(self):
+        return f"{self.cells} = {self.count}"
+
+    def decode(self):
+        for bit in self.members():
+            yield divmod(bit, self.width)
+
+    def identified_mines(self):
+        if self.count == popcount(self.mask):
+            return set(self.decode())
+        return set()
+
+    def identified_safes(self):
+        if self.count == 0:
+            return set(self.decode())
+        return set()
+
+    def remove_cell(self, cell):
+        # Devuelve True si la celda estaba en la sentencia
+        bit = cell[0] * self.width + cell[1] - self.offset
+        if bit < 0 or not self.mask >> bit & 1:
+            return False
+        self.mask ^= 1 << bit
+        self.normalize()
+        return True
+
+    def mark_cell_as_mine(self, cell):
+        if self.remove_cell(cell):
+            self.count = self.count - 1
+
+    def mark_cell_as_safe(self, cell):
+        self.remove_cell(cell)
+
+    def key(self):
+        return self.mask, self.offset, self.count
+
+    def size(self):
+        return popcount(self.mask)
+
+    def members(self):
+        mask = self.mask
+        offset = self.offset
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1 + offset
+            mask ^= low
+
+    def aligned(self, other):
+        # Máscara de other con los bits de self: las celdas anteriores a self.offset se descartan
+        shift = other.offset - self.offset
+        return other.mask << shift if shift >= 0 else other.mask >> -shift
+
+    def is_proper_subset(self, other):
+        if not self.mask:
+            return other.mask != 0
+        if self.offset < other.offset:
+            return False
+        return self.mask & self.aligned(other) == self.mask and (self.offset != other.offset or self.mask != other.mask)
+
+    def memory(self):
+        return sys.getsizeof(self) + sys.getsizeof(self.mask)
+
+    def difference(self, other):
+        return BitSentence(self.mask & ~self.aligned(other), self.count - other.count, self.width, self.offset)
+
+class KnowledgeBase():
+    def __init__(self, cell_key=None):
+        # cell_key traduce una celda (i, j) a la clave que usan las sentencias en el índice
+        self.cell_key = cell_key
+        self.sentences = {}
+        self.keys = {}
+        # Índice invertido celda -> ids de las sentencias que la contienen
+        self.index = {}
+        self.next_id = 0
+        # Sentencias que cambiaron y aún no se revisan / no se comparan con las demás
+        self.dirty = {}
+        self.pending = {}
+        # Sentencias derivadas en orden de creación: son las primeras en desalojarse
+        self.derived = {}
+        # Estadísticas de la recolección: sentencias quitadas por motivo y bytes liberados
+        self.collected = {"subsumed": 0, "evicted": 0}
+        self.bytes_freed = 0
+
+    def __len__(self):
+        return len(self.sentences)
+
+    def __iter__(self):
+        return iter(list(self.sentences.values()))
+
+    def __contains__(self, sentence):
+        return sentence.key() in self.keys
+
+    def add(self, sentence, derived=False):
+        if sentence.size() == 0:
+            return None
+        key = sentence.key()
+        if key in self.keys:
+            return None
+
+        sentence_id = self.next_id
+        self.next_id += 1
+        self.sentences[sentence_id] = sentence
+        self.keys[key] = sentence_id
+        for cell in sentence.members():
+            self.index.setdefault(cell, set()).add(sentence_id)
+        self.dirty[sentence_id] = None
+        self.pending[sentence_id] = None
+        if derived:
+            self.derived[sentence_id] = None
+        return sentence_id
+
+    def remove(self, sentence_id):
+        sentence = self.sentences[sentence_id]
+        del self.keys[sentence.key()]
+        self._discard(sentence_id)
+
+    def _discard(self, sentence_id):
+        sentence = self.sentences.pop(sentence_id)
+        self.dirty.pop(sentence_id, None)
+        self.pending.pop(sentence_id, None)
+        self.derived.pop(sentence_id, None)
+        for cell in sentence.members():
+            ids = self.index.get(cell)
+            if ids is not None:
+                ids.discard(sentence_id)
+                if not ids:
+                    del self.index[cell]
+
+    def collect(self, sentence_id, reason):
+        self.collected[reason] += 1
+        self.bytes_freed += self.sentences[sentence_id].memory()
+        self.remove(sentence_id)
+
+    def remove_implied(self, sentence):
+        # Quita la sentencia si sigue en la base; devuelve True si la quitó
+        sentence_id = self.keys.get(sentence.key())
+        if sentence_id is None or self.sentences[sentence_id] is not sentence:
+            return False
+        self.collect(sentence_id, "subsumed")
+        return True
+
+    def evict(self, limit):
+        # Primero las derivadas más antiguas y, si no queda ninguna, las observaciones más antiguas.
+        # Quitar una sentencia solo pierde información: lo que se sigue deduciendo es correcto
+        evicted = 0
+        while len(self.sentences) > limit:
+            source = self.derived if self.derived else self.sentences
+            self.collect(next(iter(source)), "evicted")
+            evicted += 1
+        return evicted
+
+    def pop_dirty(self):
+        if not self.dirty:
+            return None
+        sentence_id, _ = self.dirty.popitem()
+        return self.sentences[sentence_id]
+
+    def take_pending(self):
+        pending = [self.sentences[sentence_id] for sentence_id in self.pending]
+        self.pending.clear()
+        return pending
+
+    def supersets(self, sentence):
+        ids = [self.index.get(cell, ()) for cell in sentence.members()]
+        if not ids:
+            return []
+        ids.sort(key=len)
+        size = sentence.size()
+        return [self.sentences[sentence_id]
+                for sentence_id in set(ids[0]).intersection(*ids[1:])
+                if self.sentences[sentence_id].size() > size]
+
+    def subsets(self, sentence):
+        ids = set()
+        for cell in sentence.members():
+            ids.update(self.index.get(cell, ()))
+        return [self.sentences[sentence_id]
+                for sentence_id in ids
+                if self.sentences[sentence_id].is_proper_subset(sentence)]
+
+    def covers(self, cell):
+        # True si alguna sentencia menciona la celda (es decir, está en la frontera)
+        return (self.cell_key(cell) if self.cell_key else cell) in self.index
+
+    def mark_cell_as_mine(self, cell):
+        self._update_cell(cell, True)
+
+    def mark_cell_as_safe(self, cell):
+        self._update_cell(cell, False)
+
+    def _update_cell(self, cell, is_mine):
+        index_key = self.cell_key(cell) if self.cell_key else cell
+        for sentence_id in self.index.pop(index_key, ()):
+            sentence = self.sentences[sentence_id]
+            del self.keys[sentence.key()]
+            if is_mine:
+                sentence.mark_cell_as_mine(cell)
+            else:
+                sentence.mark_cell_as_safe(cell)
+
+            key = sentence.key()
+            if sentence.size() == 0 or key in self.keys:
+                # Sentencia resuelta o duplicada de otra existente
+                self._discard(sentence_id)
+                continue
+
+            self.keys[key] = sentence_id
+            self.dirty[sentence_id] = None
+            self.pending[sentence_id] = None
+
+class CellPool():
+    # Conjunto indexado de celdas del tablero: arreglo de índices i * width + j + posición de cada uno
+    # (-1 si no está). Quitar una celda la cambia por la última del arreglo, así que quitar y elegir al
+    # azar cuestan O(1); con arreglos de enteros de 4 bytes un tablero de 1000x1000 ocupa 8 MB
+    def __init__(self, height, width):
+        self.width = width
+        self.cells = array("i", range(height * width))
+        self.position = array("i", range(height * width))
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return self.position[cell[0] * self.width + cell[1]] >= 0
+
+    def __iter__(self):
+        width = self.width
+        return iter([divmod(index, width) for index in self.cells])
+
+    def discard(self, cell):
+        index = cell[0] * self.width + cell[1]
+        i = self.position[index]
+        if i < 0:
+            return
+        self.position[index] = -1
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.position[last] = i
+
+    def sample(self, rng, weight=None, attempts=32):
+        # Con weight (celda -> valor entre 0 y 1) se muestrea por rechazo: cada intento es O(1) y,
+        # si ninguno se acepta, se devuelve una celda uniforme
+        if not self.cells:
+            return None
+        cell = divmod(rng.choice(self.cells), self.width)
+        if weight is None:
+            return cell
+        for _ in range(attempts):
+            if rng.random() < weight(cell):
+                return cell
+            cell = divmod(rng.choice(self.cells), self.width)
+        return cell
+
+def corner_weight(ai, cell):
+    # Las esquinas tienen menos vecinas y por eso más probabilidad de abrir una región
+    return 1.0 if len(ai.neighbors[cell[0]][cell[1]]) == 3 else 0.25
+
+def off_frontier_weight(ai, cell):
+    # Fuera de la frontera se gana más información que junto a celdas ya reveladas
+    return 0.25 if ai.knowledge.covers(cell) else 1.0
+
+class MinesweeperAI():
+    def __init__(self, height=8, width=8, seed=None, bitboard=False, total_mines=None,
+                 guess="probability", guess_budget=0.1, inference="rules", inference_budget=0.05,
+                 conflict_budget=2000, profile=False, guess_weight=None, knowledge_gc=False,
+                 knowledge_limit=None, patterns=None):
+        self.height = height
+        self.width = width
+        self.rng = random.Random(seed)
+        self.bitboard = bitboard
+        self.inference = inference
+        self.inference_budget = inference_budget
+        self.conflict_budget = conflict_budget
+
+        self.total_mines = total_mines
+        self.guess = guess
+        self.guess_budget = guess_budget
+        # Preferencia opcional para las adivinanzas al azar: función (ai, celda) -> peso entre 0 y 1
+        self.guess_weight = guess_weight
+        self.probability_cache = OrderedDict()
+
+        # Con knowledge_gc se quita cada sentencia B que ya está implicada por A y B - A (A subconjunto de B).
+        # Ahorra memoria pero puede perder deducciones: la regla de subconjuntos solo compara pares y no vuelve
+        # a armar B, así que un par posterior que necesitaba B ya no se dispara. knowledge_limit fija un máximo
+        # de sentencias
+        self.knowledge_gc = knowledge_gc
+        self.knowledge_limit = knowledge_limit
+
+        # Caché de patrones locales (patrones.PatternCache), consultada antes de comparar sentencias
+        self.patterns = patterns
+
+        # Sin perfil activo cada punto de medición cuesta solo una comparación con None
+        self.profile = SolverProfile() if profile else None
+
+        self.moves_made = set()
+        # Número mostrado en cada celda revelada
+        self.observed = {}
+
+        self.mines = set()
+        self.safes = set()
+        # Minas en el orden en que se descubrieron: el juego solo pone banderas en las nuevas
+        self.mine_order = []
+        # Celda -> True si es mina, False si es segura; se mantiene junto con mines y safes
+        self.known = {}
+        # Tabla compartida entre todas las IA con el mismo tamaño de tablero
+        self.neighbors = neighbor_table(height, width)
+        # Celdas que todavía no se sabe si son minas o seguras
+        self.unknown = CellPool(height, width)
+        # Montículo de movimientos seguros pendientes: (minas vecinas conocidas, -vecinas desconocidas, celda)
+        self.safe_moves = []
+
+        if bitboard:
+            self.knowledge = KnowledgeBase(lambda cell: cell[0] * width + cell[1])
+        else:
+            self.knowledge = KnowledgeBase()
+
+    def new_sentence(self, cells, count):
+        if self.bitboard:
+            return BitSentence.from_cells(cells, count, self.width)
+        return Sentence(cells, count)
+
+    def mark_cell_as_mine(self, cell):
+        self.mines.add(cell)
+        self.mine_order.append(cell)
+        self.known[cell] = True
+        self.unknown.discard(cell)
+        self.knowledge.mark_cell_as_mine(cell)
+
+    def mark_cell_as_safe(self, cell):
+        self.safes.add(cell)
+        self.known[cell] = False
+        self.unknown.discard(cell)
+        if cell not in self.moves_made:
+            heapq.heappush(self.safe_moves, self.safe_move_priority(cell))
+        self.knowledge.mark_cell_as_safe(cell)
+
+    def add_knowledge(self, cell, count):
+        self.add_knowledge_many([(cell, count)])
+
+    def add_knowledge_many(self, revealed):
+        profile = self.profile
+        if profile is not None:
+            start = time.perf_counter()
+            freed = self.knowledge.bytes_freed
+
+        # Una región revelada completa se agrega de una vez y la inferencia se hace una sola vez al final
+        for cell, count in revealed:
+            self.moves_made.add(cell)
+            self.observed[cell] = count
+            self.mark_cell_as_safe(cell)
+
+        for cell, count in revealed:
+            self.add_sentence(cell, count)
+
+        self.update_knowledge()
+
+        if self.patterns is not None:
+            self.apply_patterns(revealed)
+
+        if profile is not None:
+            inference_start = time.perf_counter()
+
+        if self.inference == "linear":
+            self.infer_linear()
+        elif self.inference == "sat":
+            self.infer_constraints()
+        else:
+            self.create_derived_sentences()
+
+        if self.knowledge_limit is not None and len(self.knowledge) > self.knowledge_limit:
+            evicted = self.knowledge.evict(self.knowledge_limit)
+            if profile is not None:
+                profile.count("gc_evicted", evicted)
+
+        if profile is not None:
+            end = time.perf_counter()
+            profile.record("inference", end - inference_start)
+            profile.record("add_knowledge", end - start)
+            profile.count("cells_observed", len(revealed))
+            profile.count("gc_bytes_freed", self.knowledge.bytes_freed - freed)
+            profile.peak("knowledge", len(self.knowledge))
+
+    def add_sentence(self, cell, count):
+        # Las minas conocidas se descuentan del conteo y las celdas conocidas no entran en la sentencia
+        known = self.known
+        cells = []
+        for neighbor in self.neighbors[cell[0]][cell[1]]:
+            state = known.get(neighbor)
+            if state is None:
+                cells.append(neighbor)
+            elif state:
+                count -= 1
+
+        self.knowledge.add(self.new_sentence(cells, count))
+
+    def pattern_window(self, center):
+        # Ventana de patrones.SIZE x patrones.SIZE alrededor de center, fila por fila
+        known = self.known
+        window = []
+        for r in range(center[0] - RADIUS, center[0] + RADIUS + 1):
+            for c in range(center[1] - RADIUS, center[1] + RADIUS + 1):
+                if not (0 <= r < self.height and 0 <= c < self.width):
+                    window.append(OFF_BOARD)
+                    continue
+                state = known.get((r, c))
+                if state is None:
+                    window.append(UNKNOWN)
+                elif state:
+                    window.append(MINE)
+                elif (r, c) in self.observed and abs(r - center[0]) <= 1 and abs(c - center[1]) <= 1:
+                    window.append(str(self.observed[(r, c)]))
+                else:
+                    window.append(SAFE)
+        return window
+
+    def apply_patterns(self, revealed):
+        profile = self.profile
+        if profile is not None:
+            start = time.perf_counter()
+            hits = self.patterns.hits
+
+        found = 0
+        for cell, _ in revealed:
+            # Solo las celdas de la frontera pueden tener deducciones locales
+            if all(neighbor in self.known for neighbor in self.neighbors[cell[0]][cell[1]]):
+                continue
+            mines, safes = self.patterns.lookup(self.pattern_window(cell))
+            for index in mines:
+                mine = (cell[0] + index // SIZE - RADIUS, cell[1] + index % SIZE - RADIUS)
+                if mine not in self.mines:
+                    self.mark_cell_as_mine(mine)
+                    found += 1
+            for index in safes:
+                safe = (cell[0] + index // SIZE - RADIUS, cell[1] + index % SIZE - RADIUS)
+                if safe not in self.safes:
+                    self.mark_cell_as_safe(safe)
+                    found += 1
+
+        self.update_knowledge()
+
+        if profile is not None:
+            profile.record("patterns", time.perf_counter() - start)
+            profile.count("pattern_hits", self.patterns.hits - hits)
+            profile.count("pattern_cells", found)
+
+    def infer_linear(self):
+        # Importación diferida: NumPy solo se necesita en este modo
+        from algebra import infer_mines_and_safes
+
+        while self.knowledge.take_pending():
+            constraints = [(sentence.cells, sentence.count) for sentence in self.knowledge]
+            mines, safes = infer_mines_and_safes(constraints)
+
+            for mine in mines:
+                if mine not in self.mines:
+                    self.mark_cell_as_mine(mine)
+
+            for safe in safes:
+                if safe not in self.safes:
+                    self.mark_cell_as_safe(safe)
+
+            self.update_knowledge()
+
+    def create_derived_sentences(self):
+        profile = self.profile
+        if profile is not None:
+            start = time.perf_counter()
+            comparisons = 0
+
+        new_sentences = []
+        supersets = []
+        # Los pares donde ninguna sentencia cambió ya se compararon en llamadas anteriores
+        for sentence in self.knowledge.take_pending():
+            pairs = [(sentence, superset) for superset in self.knowledge.supersets(sentence)]
+            pairs += [(subset, sentence) for subset in self.knowledge.subsets(sentence)]
+            if profile is not None:
+                comparisons += len(pairs)
+            for s1, s2 in pairs:
+                new_count = s2.count - s1.count
+                if new_count >= 0:
+                    new_sentences.append(s2.difference(s1))
+                    supersets.append(s2)
+
+        added = 0
+        for new_sentence in new_sentences:
+            if self.knowledge.add(new_sentence, derived=True) is not None:
+                added += 1
+
+        if self.knowledge_gc:
+            # s2 = s1 + (s2 - s1): con la diferencia ya en la base, s2 queda implicada por las otras dos.
+            # Lo deducido sigue siendo correcto, pero se pueden perder deducciones (ver __init__)
+            subsumed = 0
+            for superset, difference in zip(supersets, new_sentences):
+                if difference in self.knowledge and self.knowledge.remove_implied(superset):
+                    subsumed += 1
+            if profile is not None:
+                profile.count("gc_subsumed", subsumed)
+
+        if profile is not None:
+            profile.record("create_derived_sentences", time.perf_counter() - start)
+            profile.count("pair_comparisons", comparisons)
+            profile.count("derived_proposed", len(new_sentences))
+            profile.count("derived_added", added)
+
+        self.update_knowledge()
+
+    def update_knowledge(self):
+        profile = self.profile
+        if profile is not None:
+            start = time.perf_counter()
+            iterations = 0
+
+        sentence = self.knowledge.pop_dirty()
+        while sentence is not None:
+            if profile is not None:
+                iterations += 1
+            for mine in sentence.identified_mines():
+                if mine not in self.mines:
+                    self.mark_cell_as_mine(mine)
+
+            for safe in sentence.identified_safes():
+                if safe not in self.safes:
+                    self.mark_cell_as_safe(safe)
+
+            sentence = self.knowledge.pop_dirty()
+
+        if profile is not None:
+            profile.record("update_knowledge", time.perf_counter() - start)
+            profile.count("update_iterations", iterations)
+
+    def infer_constraints(self):
+        self.create_derived_sentences()
+
+        # La búsqueda completa solo se hace cuando las reglas no dejan ningún movimiento seguro
+        while self.get_next_safe_move() is None:
+            if not self.unknown:
+                return
+            mines_left = None if self.total_mines is None else self.total_mines - len(self.mines)
+            constraints = [(sentence.cells, sentence.count) for sentence in self.knowledge]
+            try:
+                mines, safes = deduce(constraints, self.unknown, mines_left, self.inference_budget, self.conflict_budget)
+            except BudgetExceeded:
+                return
+
+            mines -= self.mines
+            safes -= self.safes
+            if not mines and not safes:
+                return
+
+            for mine in mines:
+                self.mark_cell_as_mine(mine)
+
+            for safe in safes:
+                self.mark_cell_as_safe(safe)
+
+            self.update_knowledge()
+            self.create_derived_sentences()
+
+    def choose_move(self):
+        move = self.get_next_safe_move()
+        if move is not None:
+            return move, False
+        return self.select_guess(), True
+
+    def summary(self):
+        summary = {
+            # Toda celda jugada se marca como segura, así que moves_made está contenido en safes
+            "safes": len(self.safes) - len(self.moves_made),
+            "mines": len(self.mines),
+            "knowledge": len(self.knowledge)
+        }
+        if self.profile is not None:
+            summary["add_ms"] = 1000 * self.profile.mean("add_knowledge")
+            summary["peak"] = self.profile.peaks.get("knowledge", 0)
+            summary["yield"] = self.profile.derived_yield()
+            summary["freed_kb"] = self.knowledge.bytes_freed / 1024
+        return summary
+
+    def safe_move_priority(self, cell):
+        # Primero las celdas que pueden ser cero (sin minas vecinas conocidas) y, entre ellas, las que
+        # tienen más vecinas desconocidas: son las que abren regiones más grandes. La celda desempata
+        mines = unknown = 0
+        for neighbor in self.neighbors[cell[0]][cell[1]]:
+            state = self.known.get(neighbor)
+            if state is None:
+                unknown += 1
+            elif state:
+                mines += 1
+        return (mines, -unknown, cell)
+
+    def get_next_safe_move(self):
+        # La prioridad de una celda solo empeora a medida que se conocen sus vecinas, así que basta
+        # con recalcular la de la cima y volver a insertarla si cambió
+        heap = self.safe_moves
+        while heap:
+            entry = heap[0]
+            cell = entry[2]
+            if cell in self.moves_made:
+                heapq.heappop(heap)
+                continue
+            priority = self.safe_move_priority(cell)
+            if priority != entry:
+                heapq.heapreplace(heap, priority)
+                continue
+            return cell
+        return None
+
+    def pop_safe_move(self):
+        # Saca la segura de mayor prioridad sin esperar su observación: quien llama la revela enseguida y
+        # entrega la observación después (el modo turbo de la interfaz)
+        heap = self.safe_moves
+        while heap:
+            cell = heapq.heappop(heap)[2]
+            if cell not in self.moves_made:
+                return cell
+        return None
+
+    def select_random_available_cell(self):
+        if self.guess_weight is None:
+            return self.unknown.sample(self.rng)
+        return self.unknown.sample(self.rng, lambda cell: self.guess_weight(self, cell))
+
+    def select_guess(self):
+        profile = self.profile
+        if profile is not None:
+            start = time.perf_counter()
+
+        move = None
+        if self.guess == "probability":
+            move = self.select_safest_cell()
+        if move is None:
+            move = self.select_random_available_cell()
+
+        if profile is not None:
+            profile.record("guess", time.perf_counter() - start)
+            profile.count("guesses")
+        return move
+
+    def select_safest_cell(self):
+        unknown_count = len(self.unknown)
+        if not unknown_count:
+            return None
+
+        mines_left = None if self.total_mines is None else self.total_mines - len(self.mines)
+        constraints = [(sentence.cells, sentence.count) for sentence in self.knowledge]
+        try:
+            probabilities, rest_probability = mine_probabilities(
+                constraints, unknown_count, mines_left, self.guess_budget, self.probability_cache)
+        except BudgetExceeded:
+            return None
+        if probabilities is None:
+            return None
+
+        # Solo se recorre la frontera; las celdas fuera de ella comparten rest_probability
+        rest_count = unknown_count - len(probabilities) if rest_probability is not None else 0
+        risks = list(probabilities.values())
+        if rest_count:
+            risks.append(rest_probability)
+        if not risks:
+            return None
+        lowest = min(risks)
+        ties = sorted(cell for cell, risk in probabilities.items() if risk <= lowest + 1e-12)
+        if rest_count and rest_probability <= lowest + 1e-12:
+            # Elección uniforme entre todas las empatadas sin enumerar las de fuera de la frontera
+            choice = self.rng.randrange(len(ties) + rest_count)
+            if choice >= len(ties):
+                return self.select_off_frontier_cell(probabilities)
+            return ties[choice]
+        return self.rng.choice(ties)
+
+    def select_off_frontier_cell(self, frontier):
+        # Muestreo por rechazo: en tableros grandes casi todas las celdas desconocidas están fuera de la frontera
+        while True:
+            cell = self.unknown.sample(self.rng)
+            if cell not in frontier:
+                return cell
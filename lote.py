@@ -0,0 +1,178 @@
+import argparse
+import time
+
+import numpy as np
+
+from generador import adjacent_counts, generate_boards
+from ia import MinesweeperAI
+from perfil import SolverProfile
+from simulador import add_ai_arguments, add_board_arguments, ai_options_from_args, board_from_args
+
+def dilate(mask):
+    # Celdas con al menos una vecina en mask, en todos los tableros a la vez
+    return adjacent_counts(mask) > 0
+
+class BoardBatch:
+    # Muchas partidas del mismo tamaño apiladas en arreglos (tablero, fila, columna). Las reglas triviales
+    # (conteo == desconocidas -> minas, conteo == minas conocidas -> seguras) se aplican a todos los tableros
+    # con sumas de vecinas vectorizadas; solo los tableros donde no alcanzan consultan a su MinesweeperAI
+    def __init__(self, batch, rows, cols, mines, seed=None, **ai_options):
+        self.rows = rows
+        self.cols = cols
+        self.total_mines = mines
+        self.seed = seed
+        self.ai_options = ai_options
+
+        self.start = (rows // 2, cols // 2)
+        self.mines, counts = generate_boards(batch, rows, cols, mines, seed, safe_cell=self.start)
+        self.counts = counts.astype(np.int16)
+        self.revealed = np.zeros(self.mines.shape, dtype=bool)
+        self.known_mines = np.zeros(self.mines.shape, dtype=bool)
+        # Celdas reveladas que ya se le entregaron a la IA de cada tablero
+        self.synced = np.zeros(self.mines.shape, dtype=bool)
+
+        self.lost = np.zeros(batch, dtype=bool)
+        self.won = np.zeros(batch, dtype=bool)
+        self.moves = np.zeros(batch, dtype=np.int64)
+        self.guesses = np.zeros(batch, dtype=np.int64)
+        self.ais = [None] * batch
+        self.ai_calls = 0
+
+    def active(self):
+        return ~(self.lost | self.won)
+
+    def flood(self, boards):
+        # Las celdas reveladas con 0 abren a sus vecinas hasta que ningún tablero cambie
+        while boards.size:
+            revealed = self.revealed[boards]
+            zeros = revealed & (self.counts[boards] == 0) & ~self.mines[boards]
+            grow = dilate(zeros) & ~revealed & ~self.known_mines[boards]
+            changed = grow.any(axis=(1, 2))
+            if not changed.any():
+                return
+            self.revealed[boards] = revealed | grow
+            boards = boards[changed]
+
+    def apply_rules(self, boards):
+        revealed = self.revealed[boards]
+        known_mines = self.known_mines[boards]
+        unknown = ~revealed & ~known_mines
+        unknown_neighbors = adjacent_counts(unknown)
+        mine_neighbors = adjacent_counts(known_mines)
+
+        numbered = revealed & ~self.mines[boards] & (unknown_neighbors > 0)
+        counts = self.counts[boards]
+        all_mines = numbered & (counts - mine_neighbors == unknown_neighbors)
+        all_safe = numbered & (counts == mine_neighbors)
+
+        new_mines = dilate(all_mines) & unknown
+        new_safes = dilate(all_safe) & unknown & ~new_mines
+        self.known_mines[boards] = known_mines | new_mines
+        self.revealed[boards] = revealed | new_safes
+        self.moves[boards] += new_safes.sum(axis=(1, 2))
+        return (new_mines | new_safes).any(axis=(1, 2))
+
+    def ai_move(self, board):
+        ai = self.ais[board]
+        if ai is None:
+            ai = self.ais[board] = MinesweeperAI(self.rows, self.cols, seed=f"ia-lote-{self.seed}-{board}",
+                                                 total_mines=self.total_mines, **self.ai_options)
+        new = np.flatnonzero(self.revealed[board] & ~self.synced[board])
+        self.synced[board] |= self.revealed[board]
+        counts = self.counts[board].ravel()
+        ai.add_knowledge_many([(divmod(int(index), self.cols), int(counts[index])) for index in new])
+        self.ai_calls += 1
+
+        move, guess = ai.choose_move()
+        for row, col in ai.mines:
+            self.known_mines[board, row, col] = True
+        if move is None:
+            self.lost[board] = True
+            return
+        self.moves[board] += 1
+        self.guesses[board] += guess
+        self.revealed[board][move] = True
+        if self.mines[board][move]:
+            self.lost[board] = True
+
+    def check_won(self):
+        cells_to_reveal = self.rows * self.cols - self.total_mines
+        self.won |= ~self.lost & (self.revealed.sum(axis=(1, 2)) >= cells_to_reveal)
+
+    def run(self):
+        self.revealed[:, self.start[0], self.start[1]] = True
+        self.moves += 1
+        self.flood(np.arange(len(self.won)))
+        self.check_won()
+
+        while True:
+            boards = np.flatnonzero(self.active())
+            if not boards.size:
+                break
+            progressed = self.apply_rules(boards)
+            stuck = boards[~progressed]
+            # Solo los tableros sin avance por las reglas triviales usan la inferencia completa
+            for board in stuck:
+                self.ai_move(board)
+            self.flood(boards[~self.lost[boards]])
+            self.check_won()
+        return self.results()
+
+    def results(self):
+        revealed = self.revealed.sum(axis=(1, 2))
+        results = []
+        for board in range(len(self.won)):
+            result = {
+                "seed": self.seed,
+                "board": board,
+                "rows": self.rows,
+                "cols": self.cols,
+                "mines": self.total_mines,
+                "won": bool(self.won[board]),
+                "moves": int(self.moves[board]),
+                "guesses": int(self.guesses[board]),
+                "revealed": int(revealed[board])
+            }
+            ai = self.ais[board]
+            if ai is not None and ai.profile is not None:
+                result["profile"] = ai.profile.to_dict()
+            results.append(result)
+        return results
+
+def run_batches(rows, cols, mines, games, seed=0, batch_size=1000, **ai_options):
+    # El lote k usa la semilla seed + k, así que los resultados no dependen de cómo se ejecuten
+    results = []
+    for k, start in enumerate(range(0, games, batch_size)):
+        batch = BoardBatch(min(batch_size, games - start), rows, cols, mines, seed + k, **ai_options)
+        results.extend(batch.run())
+    return results
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulación por lotes: muchas partidas avanzan a la vez con NumPy")
+    add_board_arguments(parser)
+    add_ai_arguments(parser)
+    parser.add_argument("--bloque", type=int, default=1000, help="Tableros por lote")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    rows, cols, mines = board_from_args(args)
+
+    start = time.perf_counter()
+    results = run_batches(rows, cols, mines, args.partidas, args.semilla, args.bloque, **ai_options_from_args(args))
+    elapsed = time.perf_counter() - start
+
+    wins = sum(1 for r in results if r["won"])
+    print(f"Tablero: {rows}x{cols}, {mines} minas")
+    print(f"Partidas: {len(results)} | Victorias: {wins} ({100 * wins / max(1, len(results)):.1f}%)")
+    print(f"Tiempo: {elapsed:.2f}s ({len(results) / max(elapsed, 1e-9):.1f} partidas/s)")
+
+    if args.perfil:
+        profile = SolverProfile()
+        for result in results:
+            if "profile" in result:
+                profile.merge(result["profile"])
+        profile.save(args.perfil)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+import random
+import time
+from collections import deque
+from functools import lru_cache
+
+PRESETS = {
+    "principiante": (9, 9, 10),
+    "intermedio": (16, 16, 40),
+    "experto": (16, 30, 99)
+}
+MAX_BOARD_SIZE = 1000
+
+# Desde este número de celdas las vecinas se calculan al consultarlas: la tabla completa de un tablero
+# de 1000x1000 ocuparía cientos de MB
+LAZY_NEIGHBORS_CELLS = 40000
+
+def neighbors_of(rows, cols, row, col):
+    if 0 < row < rows - 1 and 0 < col < cols - 1:
+        # Celda interior: las 8 vecinas sin comprobar bordes, en el mismo orden que el caso general
+        up, down, left, right = row - 1, row + 1, col - 1, col + 1
+        return ((up, left), (up, col), (up, right), (row, left),
+                (row, right), (down, left), (down, col), (down, right))
+    return tuple((r, c)
+                 for r in range(max(0, row - 1), min(rows, row + 2))
+                 for c in range(max(0, col - 1), min(cols, col + 2))
+                 if (r, c) != (row, col))
+
+class LazyNeighborRow:
+    __slots__ = ("rows", "cols", "row")
+
+    def __init__(self, rows, cols, row):
+        self.rows = rows
+        self.cols = cols
+        self.row = row
+
+    def __getitem__(self, col):
+        return neighbors_of(self.rows, self.cols, self.row, col)
+
+class LazyNeighborTable:
+    # Misma interfaz que la tabla precalculada, sin guardar nada
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+
+    def __getitem__(self, row):
+        return LazyNeighborRow(self.rows, self.cols, row)
+
+@lru_cache(maxsize=None)
+def neighbor_table(rows, cols):
+    # neighbor_table(rows, cols)[row][col] -> tupla con las celdas vecinas dentro del tablero
+    if rows * cols >= LAZY_NEIGHBORS_CELLS:
+        return LazyNeighborTable(rows, cols)
+    return tuple(
+        tuple(
+            tuple((r, c)
+                  for r in range(max(0, row - 1), min(rows, row + 2))
+                  for c in range(max(0, col - 1), min(cols, col + 2))
+                  if (r, c) != (row, col))
+            for col in range(cols))
+        for row in range(rows))
+
+class Cell:
+    __slots__ = ("is_mine", "is_revealed", "is_flagged", "adjacent_mines")
+
+    def __init__(self):
+        self.is_mine = False
+        self.is_revealed = False
+        self.is_flagged = False
+        self.adjacent_mines = 0
+
+def flag_property(name):
+    def get(self):
+        return bool(getattr(self.board, name)[self.index])
+
+    def set(self, value):
+        getattr(self.board, name)[self.index] = bool(value)
+
+    return property(get, set)
+
+class CellView:
+    # Vista de una celda de Board con la misma interfaz que Cell; no copia datos
+    __slots__ = ("board", "index")
+
+    def __init__(self, board, index):
+        self.board = board
+        self.index = index
+
+    is_mine = flag_property("mine")
+    is_revealed = flag_property("revealed")
+    is_flagged = flag_property("flagged")
+
+    @property
+    def adjacent_mines(self):
+        return self.board.adjacent[self.index]
+
+    @adjacent_mines.setter
+    def adjacent_mines(self, value):
+        self.board.adjacent[self.index] = value
+
+class BoardRow:
+    __slots__ = ("board", "start", "cols")
+
+    def __init__(self, board, row):
+        self.board = board
+        self.start = row * board.cols
+        self.cols = board.cols
+
+    def __len__(self):
+        return self.cols
+
+    def __getitem__(self, col):
+        if not 0 <= col < self.cols:
+            raise IndexError(col)
+        return CellView(self.board, self.start + col)
+
+    def __iter__(self):
+        return (CellView(self.board, self.start + col) for col in range(self.cols))
+
+class Board:
+    # Tablero como estructura de arreglos: un bytearray por atributo en lugar de un objeto por celda.
+    # board[row][col] devuelve una vista con la interfaz de Cell
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        size = rows * cols
+        self.mine = bytearray(size)
+        self.revealed = bytearray(size)
+        self.flagged = bytearray(size)
+        self.adjacent = bytearray(size)
+
+    def clear(self):
+        # Se reutilizan los mismos arreglos entre partidas
+        empty = bytes(self.rows * self.cols)
+        self.mine[:] = empty
+        self.revealed[:] = empty
+        self.flagged[:] = empty
+        self.adjacent[:] = empty
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.rows:
+            raise IndexError(row)
+        return BoardRow(self, row)
+
+    def __iter__(self):
+        return (BoardRow(self, row) for row in range(self.rows))
+
+    def to_numpy(self):
+        # Vistas de NumPy (rows x cols) sobre los mismos datos, sin copiarlos
+        import numpy as np
+
+        return {name: np.frombuffer(getattr(self, name), dtype=np.uint8).reshape(self.rows, self.cols)
+                for name in ("mine", "revealed", "flagged", "adjacent")}
+
+class MinesweeperGame:
+    def __init__(self, rows=9, cols=9, total_mines=10, seed=None, ai=None):
+        self.rows = rows
+        self.cols = cols
+        self.total_mines = total_mines
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.ai = ai
+        # Registro opcional de la partida (por ejemplo, un repeticion.GameLog)
+        self.log = None
+        self.reset_game_state()
+
+    def start_recording(self, log):
+        self.log = log
+        log.start(self.rows, self.cols, self.total_mines, self.seed)
+
+    def reset_game_state(self):
+        self.game_over = False
+        self.game_won = False
+        self.first_click = True
+        self.start_time = None
+        self.elapsed_time = 0
+        self.mines_flagged = 0
+        self.cells_revealed = 0
+        self.ai_moves = 0
+        self.ai_guesses = 0
+        # Minas de la IA ya marcadas con bandera: posición en ai.mine_order hasta donde se recorrió
+        self.ai_flag_source = None
+        self.ai_flag_cursor = 0
+        self.create_empty_grid()
+        if self.log is not None:
+            self.log.start(self.rows, self.cols, self.total_mines, self.seed)
+
+    def create_empty_grid(self):
+        board = getattr(self, "board", None)
+        if board is None or board.rows != self.rows or board.cols != self.cols:
+            self.board = Board(self.rows, self.cols)
+        else:
+            self.board.clear()
+        self.grid = self.board
+
+    def create_game_grid(self):
+        self.create_empty_grid()
+
+    def start_game(self, first_click_row, first_click_col):
+        self.create_game_grid()
+        self.mines_flagged = 0
+        self.place_mines(first_click_row, first_click_col)
+        if self.log is not None:
+            self.log.set_board(self.board.mine)
+        self.first_click = False
+        self.start_time = time.time()
+
+    def place_mines(self, first_click_row, first_click_col):
+        # Muestreo sin reemplazo en un solo paso: no se degrada con densidades altas de minas
+        first_click = first_click_row * self.cols + first_click_col
+        candidates = [i for i in range(self.rows * self.cols) if i != first_click]
+        mine = self.board.mine
+        for index in self.rng.sample(candidates, self.total_mines):
+            mine[index] = 1
+
+        self.calculate_adjacent_mines()
+
+    def calculate_adjacent_mines(self):
+        mine = self.board.mine
+        adjacent = self.board.adjacent
+        adjacent[:] = bytes(len(adjacent))
+
+        # Cada mina suma uno a sus vecinas, en lugar de contar las vecinas de cada celda
+        neighbors = neighbor_table(self.rows, self.cols)
+        cols = self.cols
+        for index in range(len(mine)):
+            if mine[index]:
+                for r, c in neighbors[index // cols][index % cols]:
+                    adjacent[r * cols + c] += 1
+
+        for index in range(len(mine)):
+            if mine[index]:
+                adjacent[index] = 0
+
+    def load_board(self, mines, counts=None):
+        # Carga un tablero ya generado (por ejemplo, uno de generador.generate_boards)
+        self.create_game_grid()
+        self.board.mine[:] = bytes(bool(mines[row][col]) for row in range(self.rows) for col in range(self.cols))
+        if counts is None:
+            self.calculate_adjacent_mines()
+        else:
+            mine = self.board.mine
+            self.board.adjacent[:] = bytes(0 if mine[row * self.cols + col] else int(counts[row][col])
+                                           for row in range(self.rows) for col in range(self.cols))
+        if self.log is not None:
+            self.log.set_board(self.board.mine)
+        self.first_click = False
+        self.start_time = time.time()
+
+    def reveal_cell(self, row, col, guess=False):
+        revealed = self.reveal_region(row, col, guess)
+        if self.ai and not self.game_over:
+            observations = self.observations(revealed)
+            if observations:
+                self.ai.add_knowledge_many(observations)
+        return revealed
+
+    def reveal_region(self, row, col, guess=False):
+        if row < 0 or row >= self.rows or col < 0 or col >= self.cols:
+            return []
+        board = self.board
+        cols = self.cols
+        index = row * cols + col
+        if board.revealed[index] or board.flagged[index]:
+            return []
+        if self.log is not None:
+            self.log.reveal(row, col, guess)
+
+        if board.mine[index]:
+            board.revealed[index] = 1
+            self.cells_revealed += 1
+            self.game_over = True
+            for i in range(len(board.mine)):
+                if board.mine[i]:
+                    board.revealed[i] = 1
+            return [(row, col)]
+
+        # Recorrido en anchura: las celdas con 0 abren a sus vecinas sin recursión
+        neighbors = neighbor_table(self.rows, self.cols)
+        revealed_cells = board.revealed
+        flagged = board.flagged
+        adjacent = board.adjacent
+        revealed = []
+        queue = deque([(row, col)])
+        revealed_cells[index] = 1
+        while queue:
+            r, c = queue.popleft()
+            revealed.append((r, c))
+            if adjacent[r * cols + c] == 0:
+                for nr, nc in neighbors[r][c]:
+                    neighbor = nr * cols + nc
+                    if not revealed_cells[neighbor] and not flagged[neighbor]:
+                        revealed_cells[neighbor] = 1
+                        queue.append((nr, nc))
+
+        self.cells_revealed += len(revealed)
+        return revealed
+
+    def revealed_cells(self):
+        cols = self.cols
+        return [divmod(index, cols) for index, revealed in enumerate(self.board.revealed) if revealed]
+
+    def observations(self, revealed):
+        mine = self.board.mine
+        adjacent = self.board.adjacent
+        cols = self.cols
+        return [((row, col), adjacent[row * cols + col])
+                for row, col in revealed if not mine[row * cols + col]]
+
+    def toggle_flag(self, row, col):
+        index = row * self.cols + col
+        if self.board.revealed[index]:
+            return
+
+        if self.board.flagged[index]:
+            self.board.flagged[index] = 0
+            self.mines_flagged -= 1
+        else:
+            self.board.flagged[index] = 1
+            self.mines_flagged += 1
+        # start_game descarta las banderas puestas antes del primer clic: registrarlas rompería la repetición
+        if self.log is not None and not self.first_click:
+            self.log.flag(row, col)
+
+    def check_win(self):
+        # La mina pisada también suma a cells_revealed: una derrota no puede contarse como victoria
+        cells_to_reveal = self.rows * self.cols - self.total_mines
+        if not self.game_over and self.cells_revealed >= cells_to_reveal:
+            self.game_won = True
+
+    def ai_first_move(self):
+        move = (self.rows // 2, self.cols // 2)
+        self.start_game(*move)
+        revealed = self.reveal_region(*move)
+        self.ai_moves += 1
+        self.check_win()
+        return move, revealed
+
+    def apply_ai_move(self, move, guess, feed=True):
+        # Con feed=False el conocimiento lo agrega quien llama (por ejemplo, el hilo de la IA)
+        revealed = self.reveal_cell(*move, guess) if feed else self.reveal_region(*move, guess)
+        self.ai_moves += 1
+        if guess:
+            self.ai_guesses += 1
+
+        # Solo se recorren las minas que la IA encontró desde la jugada anterior
+        mine_order = self.ai.mine_order
+        if self.ai_flag_source is not mine_order:
+            self.ai_flag_source = mine_order
+            self.ai_flag_cursor = 0
+        new_mines = mine_order[self.ai_flag_cursor:]
+        self.ai_flag_cursor += len(new_mines)
+        for mine_row, mine_col in new_mines:
+            if 0 <= mine_row < self.rows and 0 <= mine_col < self.cols:
+                index = mine_row * self.cols + mine_col
+                if not self.board.revealed[index] and not self.board.flagged[index]:
+                    self.board.flagged[index] = 1
+                    if self.log is not None:
+                        self.log.flag(mine_row, mine_col)
+
+        self.check_win()
+        return revealed
+
+    def ai_step(self):
+        if not self.ai or self.game_over or self.game_won:
+            return None
+
+        if self.first_click:
+            move, revealed = self.ai_first_move()
+            self.ai.add_knowledge_many(self.observations(revealed))
+            return move
+
+        move, guess = self.ai.choose_move()
+        if move is None:
+            return None
+        self.apply_ai_move(move, guess)
+        return move
@@ -0,0 +1,121 @@
+import json
+import os
+from collections import OrderedDict
+
+from probabilidad import BudgetExceeded
+from restricciones import deduce
+
+# Ventana de 5x5 alrededor de una celda revelada. Solo las celdas reveladas del 3x3 central aportan
+# restricciones: todas sus vecinas caen dentro de la ventana, así que lo que se deduce es correcto
+RADIUS = 2
+SIZE = 2 * RADIUS + 1
+
+# Un carácter por celda de la ventana; las reveladas del centro se escriben con el número mostrado.
+# Sus minas vecinas conocidas también están en la ventana y se descuentan al resolverla
+OFF_BOARD = "#"
+MINE = "*"
+SAFE = "."
+UNKNOWN = "?"
+
+def symmetries():
+    # Las 8 simetrías del cuadrado; perm[i] es la posición de la ventana original que queda en i
+    perms = []
+    for transpose in (False, True):
+        for flip_rows in (False, True):
+            for flip_cols in (False, True):
+                perm = []
+                for i in range(SIZE):
+                    for j in range(SIZE):
+                        r, c = (j, i) if transpose else (i, j)
+                        if flip_rows:
+                            r = SIZE - 1 - r
+                        if flip_cols:
+                            c = SIZE - 1 - c
+                        perm.append(r * SIZE + c)
+                perms.append(tuple(perm))
+    return perms
+
+SYMMETRIES = symmetries()
+
+def canonical(window):
+    # La clave canónica es la menor de las 8 transformaciones de la ventana
+    best_key, best_perm = None, None
+    for perm in SYMMETRIES:
+        key = "".join([window[i] for i in perm])
+        if best_key is None or key < best_key:
+            best_key, best_perm = key, perm
+    return best_key, best_perm
+
+def solve_window(key):
+    constraints = []
+    for r in range(1, SIZE - 1):
+        for c in range(1, SIZE - 1):
+            code = key[r * SIZE + c]
+            if not code.isdigit():
+                continue
+            neighbors = [nr * SIZE + nc
+                         for nr in (r - 1, r, r + 1)
+                         for nc in (c - 1, c, c + 1)
+                         if (nr, nc) != (r, c)]
+            cells = [cell for cell in neighbors if key[cell] == UNKNOWN]
+            if cells:
+                constraints.append((cells, int(code) - sum(key[cell] == MINE for cell in neighbors)))
+    if not constraints:
+        return (), ()
+
+    unknown = {cell for cells, _ in constraints for cell in cells}
+    mines, safes = deduce(constraints, unknown)
+    return tuple(sorted(mines)), tuple(sorted(safes))
+
+class PatternCache:
+    def __init__(self, path=None, capacity=50000):
+        self.path = path
+        self.capacity = capacity
+        # Clave canónica -> (minas, seguras) como posiciones de la ventana canónica, en orden LRU
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, window):
+        # Devuelve (minas, seguras) como posiciones de la ventana recibida
+        key, perm = canonical(window)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            try:
+                entry = solve_window(key)
+            except BudgetExceeded:
+                return (), ()
+            self.entries[key] = entry
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+
+        mines, safes = entry
+        return [perm[i] for i in mines], [perm[i] for i in safes]
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def save(self, path=None):
+        with open(path or self.path, "w") as f:
+            json.dump({"size": SIZE, "patterns": {key: [list(mines), list(safes)]
+                                                  for key, (mines, safes) in self.entries.items()}}, f)
+
+    def load(self, path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("size") != SIZE:
+            return
+        for key, (mines, safes) in data["patterns"].items():
+            self.entries[key] = (tuple(mines), tuple(safes))
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
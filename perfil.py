@@ -0,0 +1,69 @@
+import json
+
+# Histogramas en potencias de dos de microsegundos: el balde i cuenta tiempos menores a 2**i µs
+HISTOGRAM_BUCKETS = 24
+
+class SolverProfile:
+    def __init__(self):
+        self.counters = {}
+        self.peaks = {}
+        self.timings = {}
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def peak(self, name, value):
+        if value > self.peaks.get(name, 0):
+            self.peaks[name] = value
+
+    def record(self, phase, seconds):
+        timing = self.timings.get(phase)
+        if timing is None:
+            timing = self.timings[phase] = {"calls": 0, "total": 0.0, "max": 0.0,
+                                            "histogram": [0] * HISTOGRAM_BUCKETS}
+        timing["calls"] += 1
+        timing["total"] += seconds
+        if seconds > timing["max"]:
+            timing["max"] = seconds
+        bucket = min(HISTOGRAM_BUCKETS - 1, int(seconds * 1e6).bit_length())
+        timing["histogram"][bucket] += 1
+
+    def mean(self, phase):
+        timing = self.timings.get(phase)
+        if not timing or not timing["calls"]:
+            return 0.0
+        return timing["total"] / timing["calls"]
+
+    def derived_yield(self):
+        proposed = self.counters.get("derived_proposed", 0)
+        return self.counters.get("derived_added", 0) / proposed if proposed else 0.0
+
+    def to_dict(self):
+        return {
+            "counters": dict(self.counters),
+            "peaks": dict(self.peaks),
+            "timings": {phase: dict(timing, histogram=list(timing["histogram"]))
+                        for phase, timing in self.timings.items()},
+            "derived_yield": self.derived_yield()
+        }
+
+    def merge(self, data):
+        if isinstance(data, SolverProfile):
+            data = data.to_dict()
+        for name, value in data["counters"].items():
+            self.count(name, value)
+        for name, value in data["peaks"].items():
+            self.peak(name, value)
+        for phase, other in data["timings"].items():
+            timing = self.timings.get(phase)
+            if timing is None:
+                self.timings[phase] = dict(other, histogram=list(other["histogram"]))
+                continue
+            timing["calls"] += other["calls"]
+            timing["total"] += other["total"]
+            timing["max"] = max(timing["max"], other["max"])
+            timing["histogram"] = [a + b for a, b in zip(timing["histogram"], other["histogram"])]
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,226 @@
+import math
+import time
+from collections import OrderedDict, deque
+
+class BudgetExceeded(Exception):
+    pass
+
+# Con más celdas fuera de la frontera que esto, los pesos se calculan en coma flotante con logaritmos:
+# math.comb exacto para el resto de un tablero de 1000x1000 tarda segundos
+EXACT_REST_LIMIT = 5000
+
+def ways(n, k):
+    if k < 0 or k > n:
+        return 0
+    return math.comb(n, k)
+
+def log_ways(n, k):
+    if k < 0 or k > n:
+        return None
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+def relative_ways(n, mines_left, frontier_counts):
+    # ways(n, mines_left - k) dividido por el mayor de ellos, para cada k de frontier_counts
+    logs = {k: log_ways(n, mines_left - k) for k in frontier_counts}
+    top = max((value for value in logs.values() if value is not None), default=0.0)
+    return {k: 0.0 if value is None else math.exp(value - top) for k, value in logs.items()}
+
+def split_components(constraints):
+    parent = {}
+
+    def find(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    for cells, _ in constraints:
+        for cell in cells:
+            parent.setdefault(cell, cell)
+        cells = list(cells)
+        for cell in cells[1:]:
+            a, b = find(cells[0]), find(cell)
+            if a != b:
+                parent[b] = a
+
+    groups = OrderedDict()
+    for cells, count in constraints:
+        root = find(next(iter(cells)))
+        groups.setdefault(root, []).append((cells, count))
+    return list(groups.values())
+
+def order_cells(constraints):
+    # Recorrido en anchura por las restricciones: las celdas vecinas quedan juntas y hay menos restricciones abiertas
+    by_cell = {}
+    for index, (cells, _) in enumerate(constraints):
+        for cell in cells:
+            by_cell.setdefault(cell, []).append(index)
+
+    order = []
+    seen_cells = set()
+    seen_constraints = set()
+    queue = deque([0])
+    seen_constraints.add(0)
+    while queue:
+        index = queue.popleft()
+        for cell in sorted(constraints[index][0]):
+            if cell in seen_cells:
+                continue
+            seen_cells.add(cell)
+            order.append(cell)
+            for other in by_cell[cell]:
+                if other not in seen_constraints:
+                    seen_constraints.add(other)
+                    queue.append(other)
+    return order
+
+def enumerate_component(constraints, deadline):
+    cells = order_cells(constraints)
+    n = len(cells)
+    position = {cell: i for i, cell in enumerate(cells)}
+
+    # touching[i]: restricciones que contienen la celda i y cuántas de sus celdas quedan después de ella
+    touching = [[] for _ in range(n)]
+    # active[i]: restricciones con celdas asignadas antes de i y celdas pendientes desde i
+    active = [[] for _ in range(n + 1)]
+    for c, (constraint_cells, _) in enumerate(constraints):
+        positions = sorted(position[cell] for cell in constraint_cells)
+        for k, p in enumerate(positions):
+            touching[p].append((c, len(positions) - k - 1))
+        for i in range(positions[0] + 1, positions[-1] + 1):
+            active[i].append(c)
+
+    need = [count for _, count in constraints]
+    memo = {}
+    calls = 0
+    done = {0: (1, ())}
+
+    def merge(result, suffix, value):
+        for mines, (count, hits) in suffix.items():
+            hits = (value * count,) + hits
+            entry = result.get(mines + value)
+            if entry is None:
+                result[mines + value] = (count, hits)
+            else:
+                result[mines + value] = (entry[0] + count, tuple(a + b for a, b in zip(entry[1], hits)))
+
+    # Búsqueda en profundidad con una pila explícita: la profundidad es el número de celdas de la componente
+    # y una frontera grande superaría el límite de recursión. Cada marco es [celda, clave, siguiente valor,
+    # resultado parcial]; returned es el resultado del marco que se acaba de cerrar
+    stack = []
+    returned = None
+    i = 0
+    while True:
+        if i == n:
+            returned = done
+        else:
+            key = (i, tuple(need[c] for c in active[i]))
+            returned = memo.get(key)
+            if returned is None:
+                calls += 1
+                if calls % 256 == 0 and time.perf_counter() > deadline:
+                    raise BudgetExceeded()
+                stack.append([i, key, 0, {}])
+
+        while stack:
+            frame = stack[-1]
+            i, key, value, result = frame
+            if returned is not None:
+                # Vuelta del valor value - 1 asignado a la celda i
+                for c, _ in touching[i]:
+                    need[c] += value - 1
+                merge(result, returned, value - 1)
+                returned = None
+
+            while value < 2 and any(need[c] - value < 0 or need[c] - value > remaining
+                                    for c, remaining in touching[i]):
+                value += 1
+            if value == 2:
+                memo[key] = result
+                stack.pop()
+                returned = result
+                continue
+
+            frame[2] = value + 1
+            for c, _ in touching[i]:
+                need[c] -= value
+            i += 1
+            break
+        else:
+            return cells, returned
+
+def convolve(a, b):
+    result = {}
+    for ka, wa in a.items():
+        for kb, wb in b.items():
+            result[ka + kb] = result.get(ka + kb, 0) + wa * wb
+    return result
+
+def mine_probabilities(constraints, unknown_count, mines_left=None, time_budget=0.1, cache=None, cache_size=256):
+    deadline = time.perf_counter() + time_budget
+    constraints = [(frozenset(cells), count) for cells, count in constraints if cells]
+
+    components = []
+    for component in split_components(constraints):
+        key = frozenset(component)
+        solved = cache.get(key) if cache is not None else None
+        if solved is None:
+            solved = enumerate_component(component, deadline)
+            if cache is not None:
+                cache[key] = solved
+                if len(cache) > cache_size:
+                    cache.popitem(last=False)
+        elif cache is not None:
+            cache.move_to_end(key)
+        components.append(solved)
+
+    frontier_count = sum(len(cells) for cells, _ in components)
+    rest = unknown_count - frontier_count
+    distributions = [{k: count for k, (count, _) in solutions.items()} for _, solutions in components]
+
+    total_distribution = {0: 1}
+    for distribution in distributions:
+        total_distribution = convolve(total_distribution, distribution)
+
+    # Solo importan los pesos relativos: escalarlos no cambia las probabilidades
+    scaled = None
+    if mines_left is not None and rest > EXACT_REST_LIMIT:
+        scaled = relative_ways(rest, mines_left, total_distribution)
+
+    def weight(frontier_mines):
+        if mines_left is None:
+            return 1
+        if scaled is not None:
+            return scaled.get(frontier_mines, 0.0)
+        return ways(rest, mines_left - frontier_mines)
+    total = sum(w * weight(k) for k, w in total_distribution.items())
+    if total == 0:
+        return None, None
+
+    probabilities = {}
+    for index, (cells, solutions) in enumerate(components):
+        others = {0: 1}
+        for other_index, distribution in enumerate(distributions):
+            if other_index != index:
+                others = convolve(others, distribution)
+        for mines, (_, hits) in solutions.items():
+            factor = sum(w * weight(mines + k) for k, w in others.items())
+            if factor == 0:
+                continue
+            for cell, hit in zip(cells, hits):
+                probabilities[cell] = probabilities.get(cell, 0) + hit * factor
+
+    probabilities = {cell: value / total for cell, value in probabilities.items()}
+    for cells, _ in components:
+        for cell in cells:
+            probabilities.setdefault(cell, 0.0)
+
+    if rest <= 0:
+        rest_probability = None
+    elif mines_left is None:
+        rest_probability = sum(probabilities.values()) / len(probabilities) if probabilities else 0.5
+    else:
+        expected = sum(w * weight(k) * (mines_left - k) for k, w in total_distribution.items())
+        rest_probability = expected / (total * rest)
+
+    return probabilities, rest_probability
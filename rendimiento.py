@@ -0,0 +1,190 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from motor import PRESETS
+from simulador import add_ai_arguments, ai_options_from_args, new_game
+from torneo import percentile, wilson_interval
+
+SCENARIOS = [
+    ("principiante", *PRESETS["principiante"]),
+    ("intermedio", *PRESETS["intermedio"]),
+    ("experto", *PRESETS["experto"]),
+    ("30x30 10%", 30, 30, 90),
+    ("30x30 16%", 30, 30, 144),
+    ("30x30 20%", 30, 30, 180),
+    ("16x16 25%", 16, 16, 64)
+]
+
+# Métrica -> True si un valor mayor es peor
+COMPARED_METRICS = {
+    "move_ms_p50": True,
+    "move_ms_p99": True,
+    "solve_ms_mean": True,
+    "peak_memory_kb": True,
+    "win_rate": False
+}
+# Métricas de tiempo: varían entre corridas, así que se miden en varias rondas de las mismas partidas
+TIMED_METRICS = ["move_ms_p50", "move_ms_p90", "move_ms_p99", "move_ms_max", "solve_ms_mean", "solve_ms_p99"]
+
+def play_game(seed, rows, cols, mines, ai_options):
+    game = new_game(seed, rows, cols, mines, **ai_options)
+
+    latencies = []
+    start = time.perf_counter()
+    while not game.game_over and not game.game_won:
+        move_start = time.perf_counter()
+        move = game.ai_step()
+        latencies.append(time.perf_counter() - move_start)
+        if move is None:
+            break
+    return game.game_won, time.perf_counter() - start, latencies
+
+def peak_memory(seeds, rows, cols, mines, ai_options):
+    # Se mide aparte porque tracemalloc hace más lentas las partidas
+    peak = 0
+    for seed in seeds:
+        tracemalloc.start()
+        play_game(seed, rows, cols, mines, ai_options)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return peak
+
+def run_round(rows, cols, mines, games, seed, ai_options):
+    wins = 0
+    solve_times = []
+    latencies = []
+    for game_seed in range(seed, seed + games):
+        won, elapsed, moves = play_game(game_seed, rows, cols, mines, ai_options)
+        wins += won
+        solve_times.append(elapsed)
+        latencies.extend(moves)
+    return wins, len(latencies), {
+        "move_ms_p50": 1000 * percentile(latencies, 50),
+        "move_ms_p90": 1000 * percentile(latencies, 90),
+        "move_ms_p99": 1000 * percentile(latencies, 99),
+        "move_ms_max": 1000 * max(latencies, default=0.0),
+        "solve_ms_mean": 1000 * sum(solve_times) / games if games else 0.0,
+        "solve_ms_p99": 1000 * percentile(solve_times, 99)
+    }
+
+def scenario_result(rows, cols, mines, games, seed, memory_games, ai_options, rounds):
+    # rounds: (victorias, jugadas, tiempos) de cada ronda. Las partidas están determinadas por su semilla, así
+    # que todas las rondas juegan las mismas jugadas y solo cambian los tiempos
+    wins, moves, _ = rounds[0]
+    low, high = wilson_interval(wins, games)
+    result = {
+        "rows": rows,
+        "cols": cols,
+        "mines": mines,
+        "games": games,
+        "win_rate": wins / games if games else 0.0,
+        "win_rate_ci95": [low, high],
+        "moves": moves,
+        "peak_memory_kb": peak_memory(range(seed, seed + min(games, memory_games)), rows, cols, mines, ai_options) / 1024,
+        # Valor de cada métrica de tiempo en cada ronda; la métrica en sí es la mediana
+        "rounds": {metric: [timing[metric] for _, _, timing in rounds] for metric in TIMED_METRICS}
+    }
+    for metric in TIMED_METRICS:
+        result[metric] = percentile(result["rounds"][metric], 50)
+    return result
+
+def run_scenario(rows, cols, mines, games, seed=0, memory_games=3, ai_options=None, rounds=5):
+    ai_options = ai_options or {}
+    played = [run_round(rows, cols, mines, games, seed, ai_options) for _ in range(max(1, rounds))]
+    return scenario_result(rows, cols, mines, games, seed, memory_games, ai_options, played)
+
+def run_suite(games, seed=0, memory_games=3, ai_options=None, scenarios=SCENARIOS, rounds=5):
+    ai_options = ai_options or {}
+    # Las rondas se alternan entre escenarios: una pausa de la máquina afecta una ronda de varios escenarios
+    # y no todas las rondas de uno solo
+    played = {name: [] for name, _, _, _ in scenarios}
+    for _ in range(max(1, rounds)):
+        for name, rows, cols, mines in scenarios:
+            played[name].append(run_round(rows, cols, mines, games, seed, ai_options))
+
+    results = {}
+    for name, rows, cols, mines in scenarios:
+        results[name] = scenario_result(rows, cols, mines, games, seed, memory_games, ai_options, played[name])
+        print_scenario(name, results[name])
+    return {
+        "python": sys.version.split()[0],
+        "machine": platform.platform(),
+        "games": games,
+        "seed": seed,
+        "rounds": rounds,
+        "ai_options": ai_options,
+        "scenarios": results
+    }
+
+def print_scenario(name, result):
+    print(f"{name:>14}: victorias {100 * result['win_rate']:5.1f}% | jugada p50 {result['move_ms_p50']:7.3f}ms "
+          f"p99 {result['move_ms_p99']:8.3f}ms | partida {result['solve_ms_mean']:8.2f}ms | "
+          f"memoria {result['peak_memory_kb']:8.1f}KB")
+
+def compare(baseline, current, tolerance=0.20):
+    regressions = []
+    print(f"{'escenario':>14} {'métrica':>15} {'base':>10} {'actual':>10} {'cambio':>8}")
+    for name, result in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        for metric, higher_is_worse in COMPARED_METRICS.items():
+            old, new = base[metric], result[metric]
+            change = (new - old) / old if old else 0.0
+            if metric == "win_rate":
+                # La tasa de victorias solo empeora si sale del intervalo de confianza de la base
+                worse = new < base["win_rate_ci95"][0]
+            else:
+                # Un tiempo solo empeora si, además de superar la tolerancia, todas las rondas actuales son más
+                # lentas que todas las de la base: con 5 rondas por lado, el ruido solo separa así los dos grupos
+                # con probabilidad 1/252
+                old_rounds = base.get("rounds", {}).get(metric, [old])
+                new_rounds = result.get("rounds", {}).get(metric, [new])
+                if higher_is_worse:
+                    worse = change > tolerance and min(new_rounds) > max(old_rounds)
+                else:
+                    worse = change < -tolerance and max(new_rounds) < min(old_rounds)
+            mark = "  <-- regresión" if worse else ""
+            print(f"{name:>14} {metric:>15} {old:10.3f} {new:10.3f} {100 * change:7.1f}%{mark}")
+            if worse:
+                regressions.append((name, metric))
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de inferencia del agente de Buscaminas")
+    add_ai_arguments(parser)
+    parser.add_argument("--partidas", type=int, default=100, help="Partidas por escenario")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--memoria", type=int, default=3, help="Partidas por escenario medidas con tracemalloc")
+    parser.add_argument("--rondas", type=int, default=5,
+                        help="Veces que se juegan las partidas de cada escenario para medir los tiempos")
+    parser.add_argument("--guardar", help="Guardar los resultados como línea base en este archivo JSON")
+    parser.add_argument("--comparar", help="Comparar contra una línea base guardada")
+    parser.add_argument("--tolerancia", type=float, default=0.20, help="Empeoramiento relativo aceptado")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    ai_options = ai_options_from_args(args)
+    ai_options.pop("profile")
+
+    current = run_suite(args.partidas, args.semilla, args.memoria, ai_options, rounds=args.rondas)
+
+    if args.guardar:
+        with open(args.guardar, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.comparar:
+        with open(args.comparar) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.tolerancia)
+        if regressions:
+            print(f"{len(regressions)} regresiones encontradas")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
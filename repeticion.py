@@ -0,0 +1,220 @@
+import argparse
+import struct
+import time
+
+from motor import MinesweeperGame
+
+# Formato binario (little endian):
+#   cabecera  HEADER: firma, versión, filas, columnas, minas, hay semilla, semilla
+#   minas     mapa de bits de filas*columnas bits, la celda (i, j) es el bit i * columnas + j
+#   jugadas   cantidad (uint32) y luego una palabra uint32 por jugada: etiqueta en los 2 bits altos,
+#             índice de la celda en los 30 bajos
+MAGIC = b"BMRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBHHIBq")
+WORD = struct.Struct("<I")
+
+REVEAL = 0
+FLAG = 1
+GUESS = 2
+TAG_NAMES = {REVEAL: "revelar", FLAG: "bandera", GUESS: "adivinar"}
+
+INDEX_BITS = 30
+INDEX_MASK = (1 << INDEX_BITS) - 1
+
+class GameLog:
+    def __init__(self, rows=0, cols=0, total_mines=0, seed=None):
+        self.start(rows, cols, total_mines, seed)
+
+    def start(self, rows, cols, total_mines, seed=None):
+        self.rows = rows
+        self.cols = cols
+        self.total_mines = total_mines
+        self.seed = seed if isinstance(seed, int) else None
+        self.mines = bytes((rows * cols + 7) // 8)
+        self.moves = bytearray()
+
+    def set_board(self, mine):
+        # mine: un byte por celda, como Board.mine
+        bitmap = bytearray((self.rows * self.cols + 7) // 8)
+        for index in range(self.rows * self.cols):
+            if mine[index]:
+                bitmap[index >> 3] |= 1 << (index & 7)
+        self.mines = bytes(bitmap)
+
+    def record(self, tag, row, col):
+        self.moves += WORD.pack(tag << INDEX_BITS | (row * self.cols + col))
+
+    def reveal(self, row, col, guess=False):
+        self.record(GUESS if guess else REVEAL, row, col)
+
+    def flag(self, row, col):
+        self.record(FLAG, row, col)
+
+    def __len__(self):
+        return len(self.moves) // WORD.size
+
+    def __iter__(self):
+        # Produce (etiqueta, fila, columna) por cada jugada
+        for (word,) in WORD.iter_unpack(self.moves):
+            index = word & INDEX_MASK
+            yield word >> INDEX_BITS, index // self.cols, index % self.cols
+
+    def mine_grid(self):
+        return [[bool(self.mines[index >> 3] >> (index & 7) & 1)
+                 for index in range(row * self.cols, (row + 1) * self.cols)]
+                for row in range(self.rows)]
+
+    def to_bytes(self):
+        header = HEADER.pack(MAGIC, VERSION, self.rows, self.cols, self.total_mines,
+                             self.seed is not None, self.seed or 0)
+        return header + self.mines + WORD.pack(len(self)) + bytes(self.moves)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, rows, cols, total_mines, has_seed, seed = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("No es un archivo de repetición de Buscaminas")
+        if version != VERSION:
+            raise ValueError(f"Versión de repetición no soportada: {version}")
+
+        log = cls(rows, cols, total_mines, seed if has_seed else None)
+        offset = HEADER.size
+        log.mines = bytes(data[offset:offset + len(log.mines)])
+        offset += len(log.mines)
+        (count,) = WORD.unpack_from(data, offset)
+        offset += WORD.size
+        log.moves = bytearray(data[offset:offset + count * WORD.size])
+        if len(log) != count:
+            raise ValueError("Repetición truncada")
+        return log
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+def apply_move(game, tag, row, col):
+    if tag == FLAG:
+        game.toggle_flag(row, col)
+    else:
+        # Con game.ai definido, reveal_cell le entrega al agente las mismas observaciones de la partida original
+        game.reveal_cell(row, col)
+        if tag == GUESS:
+            game.ai_guesses += 1
+    game.check_win()
+
+def replay(log, ai=None):
+    # Reconstruye la partida sin interfaz; con ai se puede volver a medir la inferencia jugada a jugada
+    game = MinesweeperGame(log.rows, log.cols, log.total_mines, seed=log.seed, ai=ai)
+    game.load_board(log.mine_grid())
+    for tag, row, col in log:
+        apply_move(game, tag, row, col)
+    return game
+
+def play_back(log, speed=10.0):
+    # Importación diferida: pygame solo se necesita para ver la repetición
+    import pygame
+    from buscaminas import INFO_HEIGHT, MENU_HEIGHT, Minesweeper
+
+    game = Minesweeper()
+    game.show_menu = False
+    game.rows, game.cols, game.total_mines = log.rows, log.cols, log.total_mines
+    game.reset_game_state()
+    game.load_board(log.mine_grid())
+
+    size = game.calculate_window_size()
+    screen = pygame.display.set_mode(size)
+    pygame.display.set_caption("Buscaminas - repetición")
+    background = game.get_background(size)
+    clock = pygame.time.Clock()
+
+    moves = iter(log)
+    paused = False
+    first_frame = True
+    next_move_time = time.time()
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_PLUS or event.key == pygame.K_KP_PLUS:
+                    speed = min(1000.0, speed * 2)
+                elif event.key == pygame.K_MINUS or event.key == pygame.K_KP_MINUS:
+                    speed = max(0.5, speed / 2)
+
+        if not paused and time.time() >= next_move_time:
+            move = next(moves, None)
+            if move is not None:
+                apply_move(game, *move)
+            next_move_time = time.time() + 1.0 / speed
+
+        if first_frame:
+            screen.blit(background, (0, 0))
+            game.draw_info(screen)
+            game.draw_grid(screen)
+            pygame.display.flip()
+            first_frame = False
+        else:
+            info_area = pygame.Rect(0, MENU_HEIGHT, screen.get_width(), INFO_HEIGHT + 5)
+            screen.blit(background, info_area, info_area)
+            game.draw_info(screen)
+            pygame.display.update([info_area] + game.draw_grid(screen, full=False))
+        clock.tick(60)
+
+    pygame.quit()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Reproducir una partida grabada de Buscaminas")
+    parser.add_argument("archivo", help="Archivo de repetición (.bmr)")
+    parser.add_argument("--ver", action="store_true", help="Mostrar la repetición en la interfaz gráfica")
+    parser.add_argument("--velocidad", type=float, default=10.0, help="Jugadas por segundo al mostrarla")
+    parser.add_argument("--ia", action="store_true",
+                        help="Volver a entregar las observaciones a un agente nuevo y medir su inferencia")
+    parser.add_argument("--jugadas", action="store_true", help="Listar las jugadas")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    log = GameLog.load(args.archivo)
+
+    if args.ver:
+        play_back(log, args.velocidad)
+        return
+
+    if args.jugadas:
+        for number, (tag, row, col) in enumerate(log, 1):
+            print(f"{number:5d} {TAG_NAMES[tag]:>8} ({row}, {col})")
+
+    ai = None
+    if args.ia:
+        from ia import MinesweeperAI
+
+        ai = MinesweeperAI(log.rows, log.cols, total_mines=log.total_mines, profile=True)
+
+    start = time.perf_counter()
+    game = replay(log, ai)
+    elapsed = time.perf_counter() - start
+
+    seed = "" if log.seed is None else f", semilla {log.seed}"
+    print(f"Tablero: {log.rows}x{log.cols}, {log.total_mines} minas{seed}")
+    print(f"Jugadas: {len(log)} | Adivinanzas: {game.ai_guesses} | Reveladas: {game.cells_revealed}")
+    print(f"Resultado: {'victoria' if game.game_won else 'derrota' if game.game_over else 'sin terminar'}")
+    print(f"Reproducida en {1000 * elapsed:.2f} ms")
+    if ai is not None:
+        timing = ai.profile.timings.get("add_knowledge")
+        if timing:
+            print(f"Inferencia: {timing['calls']} llamadas, media {1000 * ai.profile.mean('add_knowledge'):.3f} ms, "
+                  f"máxima {1000 * timing['max']:.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import time
+
+from probabilidad import BudgetExceeded, order_cells, split_components
+
+class ConstraintSolver:
+    def __init__(self, constraints, rest=0, mines_left=None):
+        self.cells = []
+        self.components = []
+        for component in split_components(constraints):
+            cells = order_cells(component)
+            self.components.append(range(len(self.cells), len(self.cells) + len(cells)))
+            self.cells.extend(cells)
+        position = {cell: i for i, cell in enumerate(self.cells)}
+        self.component_of = [0] * len(self.cells)
+        for index, variables in enumerate(self.components):
+            for var in variables:
+                self.component_of[var] = index
+
+        self.constraints = [([position[cell] for cell in cells], count) for cells, count in constraints]
+        self.watch = [[] for _ in self.cells]
+        for c, (variables, _) in enumerate(self.constraints):
+            for var in variables:
+                self.watch[var].append(c)
+
+        # La restricción global limita cuántas minas puede haber en la frontera
+        self.global_constraint = len(self.constraints)
+        if mines_left is None:
+            self.bounds = (0, len(self.cells))
+        else:
+            self.bounds = (max(0, mines_left - rest), mines_left)
+
+        self.conflicts = 0
+        self.deadline = None
+        self.max_conflicts = None
+
+    def solve(self, assumptions=None, bounds=None, deadline=None, max_conflicts=None):
+        n = len(self.cells)
+        self.values = [-1] * n
+        self.mines = [0] * len(self.constraints)
+        self.free = [len(variables) for variables, _ in self.constraints]
+        self.total = 0
+        self.total_free = n
+        self.low, self.high = bounds or self.bounds
+        self.deadline = deadline
+        self.max_conflicts = max_conflicts
+
+        # Se decide primero la componente de las suposiciones: si no tiene solución, el conflicto aparece
+        # antes de enumerar las demás componentes, que son independientes
+        first = {self.component_of[var] for var in (assumptions or {})}
+        self.order = [var for index in sorted(first) for var in self.components[index]]
+        self.order += [var for index, variables in enumerate(self.components) if index not in first for var in variables]
+
+        trail = []
+        dirty = set(range(len(self.constraints) + 1))
+        for var, value in (assumptions or {}).items():
+            if self.values[var] == -1:
+                self.assign(var, value, trail, dirty)
+            elif self.values[var] != value:
+                return None
+
+        if not self.propagate(trail, dirty) or not self.search(trail):
+            return None
+        return list(self.values)
+
+    def assign(self, var, value, trail, dirty):
+        self.values[var] = value
+        trail.append(var)
+        for c in self.watch[var]:
+            self.free[c] -= 1
+            self.mines[c] += value
+            dirty.add(c)
+        self.total_free -= 1
+        self.total += value
+        dirty.add(self.global_constraint)
+
+    def undo(self, trail, level):
+        while len(trail) > level:
+            var = trail.pop()
+            value = self.values[var]
+            self.values[var] = -1
+            for c in self.watch[var]:
+                self.free[c] += 1
+                self.mines[c] -= value
+            self.total_free += 1
+            self.total -= value
+
+    def propagate(self, trail, dirty):
+        while dirty:
+            c = dirty.pop()
+            if c == self.global_constraint:
+                variables = range(len(self.cells))
+                mines, free, low, high = self.total, self.total_free, self.low, self.high
+            else:
+                variables, count = self.constraints[c]
+                mines, free, low, high = self.mines[c], self.free[c], count, count
+
+            if mines > high or mines + free < low:
+                return False
+            if free == 0:
+                continue
+            if mines == high:
+                forced = 0
+            elif mines + free == low:
+                forced = 1
+            else:
+                continue
+            for var in variables:
+                if self.values[var] == -1:
+                    self.assign(var, forced, trail, dirty)
+        return True
+
+    def search(self, trail):
+        # Búsqueda en profundidad con una pila explícita, como en probabilidad.enumerate_component: con muchas
+        # restricciones independientes hay una decisión por componente y la recursión superaría el límite.
+        # Cada marco es [posición en self.order, longitud del rastro antes de decidir, siguiente valor]
+        stack = []
+        start = 0
+        while True:
+            # Las variables anteriores en self.order ya están asignadas
+            pos = next((p for p in range(start, len(self.order)) if self.values[self.order[p]] == -1), None)
+            if pos is None:
+                return True
+            stack.append([pos, len(trail), 0])
+
+            while stack:
+                frame = stack[-1]
+                pos, level, value = frame
+                if value > 0:
+                    # El valor value - 1 no llevó a una solución
+                    self.undo(trail, level)
+                    self.conflicts += 1
+                    if self.max_conflicts is not None and self.conflicts > self.max_conflicts:
+                        raise BudgetExceeded()
+                    if self.deadline is not None and time.perf_counter() > self.deadline:
+                        raise BudgetExceeded()
+                    if value == 2:
+                        stack.pop()
+                        continue
+
+                # Primero se prueba "segura": en un tablero típico la mayoría de las celdas no son minas
+                frame[2] = value + 1
+                dirty = set()
+                self.assign(self.order[pos], value, trail, dirty)
+                if self.propagate(trail, dirty):
+                    start = pos + 1
+                    break
+            else:
+                return False
+
+def deduce(constraints, unknown_cells, mines_left=None, time_budget=0.05, max_conflicts=2000):
+    deadline = time.perf_counter() + time_budget
+    constraints = [(frozenset(cells), count) for cells, count in constraints if cells]
+    frontier = {cell for cells, _ in constraints for cell in cells}
+    # unknown_cells puede ser grande (por ejemplo, la reserva de celdas de la IA): las de fuera de la
+    # frontera solo se enumeran si resultan todas seguras o todas minas
+    rest_count = len(unknown_cells) - len(frontier)
+
+    solver = ConstraintSolver(constraints, rest_count, mines_left)
+    base = solver.solve(deadline=deadline, max_conflicts=max_conflicts)
+    if base is None:
+        return set(), set()
+
+    # Una celda queda determinada si ninguna asignación consistente le da el valor contrario
+    seen = [{value} for value in base]
+    mines, safes = set(), set()
+    for var, cell in enumerate(solver.cells):
+        if len(seen[var]) == 2:
+            continue
+        value = base[var]
+        # Sin conflictos la búsqueda nunca mira el reloj: con fronteras grandes cada verificación es lenta
+        if time.perf_counter() > deadline:
+            raise BudgetExceeded()
+        witness = solver.solve({var: 1 - value}, deadline=deadline, max_conflicts=max_conflicts)
+        if witness is None:
+            (mines if value else safes).add(cell)
+        else:
+            for other, other_value in enumerate(witness):
+                seen[other].add(other_value)
+
+    if rest_count and mines_left is not None:
+        low, high = solver.bounds
+        # Si la frontera no puede dejar minas fuera, todas las celdas restantes son seguras
+        if high - 1 < low or solver.solve(bounds=(low, high - 1), deadline=deadline, max_conflicts=max_conflicts) is None:
+            safes.update(cell for cell in unknown_cells if cell not in frontier)
+        elif low == mines_left - rest_count and (low + 1 > high or solver.solve(bounds=(low + 1, high), deadline=deadline, max_conflicts=max_conflicts) is None):
+            mines.update(cell for cell in unknown_cells if cell not in frontier)
+
+    return mines, safes
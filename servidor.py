@@ -0,0 +1,330 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ia import MinesweeperAI
+from motor import MAX_BOARD_SIZE, PRESETS, MinesweeperGame
+from simulador import add_ai_arguments, ai_options_from_args
+
+# Protocolo: un objeto JSON por línea en cada sentido. Cada solicitud lleva "op" y, opcionalmente, un "id"
+# que se devuelve en la respuesta. Las respuestas llevan "ok" y, si algo falla, "error".
+#   new     rows, cols, mines, seed, hints -> game
+#   reveal  game, row, col -> revealed [[fila, columna, número]] (-1 si era una mina), over, won
+#   flag    game, row, col -> flagged
+#   hint    game -> row, col, guess, mines (minas que el agente identificó desde la pista anterior)
+#   state   game -> board (una cadena por fila), over, won
+#   close   game
+#   stats   contadores del servidor
+LINE_LIMIT = 64 * 1024
+# Con más bytes sin enviar, drain() espera a que el cliente lea
+WRITE_HIGH_WATER = 256 * 1024
+
+class ProtocolError(Exception):
+    pass
+
+def is_int(value):
+    # bool es subclase de int, pero true no es una fila ni una semilla válida
+    return isinstance(value, int) and not isinstance(value, bool)
+
+# Lo que sigue corre en los procesos de partidas. Cada partida vive siempre en el mismo proceso (el del
+# índice id % procesos), junto con su agente: las jugadas, el tablero y la inferencia no pasan por el bucle
+# de eventos, y cada pista solo le entrega al agente lo revelado desde la anterior
+SESSIONS = {}
+
+class Session:
+    def __init__(self, game, ai):
+        self.game = game
+        # Agente persistente de la partida (None sin pistas) y observaciones que aún no se le entregan
+        self.ai = ai
+        self.unseen = []
+        # Minas de ai.mine_order ya enviadas en una pista
+        self.mines_sent = 0
+
+def playing(game_id):
+    session = SESSIONS.get(game_id)
+    if session is None:
+        raise ProtocolError("Partida desconocida")
+    if session.game.game_over or session.game.game_won:
+        raise ProtocolError("La partida ya terminó")
+    return session
+
+def new_session(game_id, rows, cols, mines, seed, hints, ai_options):
+    ai = None
+    if hints:
+        # Semilla distinta para el agente, como en simulador.new_game
+        ai = MinesweeperAI(rows, cols, seed=f"ia-{seed}", total_mines=mines, **ai_options)
+    SESSIONS[game_id] = Session(MinesweeperGame(rows, cols, mines, seed=seed), ai)
+
+def close_session(game_id):
+    SESSIONS.pop(game_id, None)
+
+def close_sessions(game_ids):
+    for game_id in game_ids:
+        close_session(game_id)
+
+def reveal(game_id, row, col):
+    session = playing(game_id)
+    game = session.game
+    if game.first_click:
+        game.start_game(row, col)
+    revealed = game.reveal_cell(row, col)
+    game.check_win()
+    if session.ai is not None and not game.game_over:
+        session.unseen += game.observations(revealed)
+
+    mine = game.board.mine
+    adjacent = game.board.adjacent
+    cols = game.cols
+    return ([[r, c, -1 if mine[r * cols + c] else adjacent[r * cols + c]] for r, c in revealed],
+            game.game_over, game.game_won)
+
+def flag(game_id, row, col):
+    game = playing(game_id).game
+    game.toggle_flag(row, col)
+    return bool(game.board.flagged[row * game.cols + col])
+
+def hint(game_id):
+    session = playing(game_id)
+    game = session.game
+    if game.first_click:
+        # El primer clic nunca es una mina
+        return (game.rows // 2, game.cols // 2), False, []
+
+    ai = session.ai
+    if session.unseen:
+        ai.add_knowledge_many(session.unseen)
+        session.unseen = []
+    move, guess = ai.choose_move()
+    if move is None:
+        raise ProtocolError("No quedan celdas por revelar")
+    mines = ai.mine_order[session.mines_sent:]
+    session.mines_sent += len(mines)
+    return move, guess, mines
+
+def board_state(game_id):
+    session = SESSIONS.get(game_id)
+    if session is None:
+        raise ProtocolError("Partida desconocida")
+    game = session.game
+    board = game.board
+    cols = game.cols
+    rows = []
+    for row in range(game.rows):
+        chars = []
+        for index in range(row * cols, (row + 1) * cols):
+            if board.revealed[index]:
+                chars.append("*" if board.mine[index] else str(board.adjacent[index]))
+            else:
+                chars.append("F" if board.flagged[index] else "?")
+        rows.append("".join(chars))
+    return rows, game.game_over, game.game_won
+
+class GameHandle:
+    # Lo que el bucle de eventos sabe de una partida: basta para validar las solicitudes sin ir al proceso
+    def __init__(self, rows, cols, hints):
+        self.rows = rows
+        self.cols = cols
+        self.hints = hints
+
+class GameServer:
+    def __init__(self, workers, ai_options=None, max_games=64):
+        # Un ProcessPoolExecutor de un solo proceso por trabajador: así una partida siempre va al mismo
+        self.workers = workers
+        self.ai_options = ai_options or {}
+        self.max_games = max_games
+        self.next_game = 1
+        self.connections = 0
+        self.active_games = 0
+        self.requests = 0
+        self.hints = 0
+        self.hint_time = 0.0
+
+    def worker(self, game_id):
+        return self.workers[game_id % len(self.workers)]
+
+    async def call(self, game_id, function, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.worker(game_id), function, game_id, *args)
+
+    async def handle_connection(self, reader, writer):
+        writer.transport.set_write_buffer_limits(high=WRITE_HIGH_WATER)
+        games = {}
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await self.send(writer, {"ok": False, "error": "Línea demasiado larga"})
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # Una solicitud a la vez por conexión: la siguiente línea no se lee hasta entregar la respuesta,
+                # así un cliente que no lee sus respuestas solo se frena a sí mismo
+                await self.send(writer, await self.respond(line, games))
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            self.active_games -= len(games)
+            await self.close_games(games)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def close_games(self, games):
+        by_worker = {}
+        for game_id in games:
+            by_worker.setdefault(game_id % len(self.workers), []).append(game_id)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.workers[index], close_sessions, game_ids)
+                               for index, game_ids in by_worker.items()])
+
+    async def send(self, writer, response):
+        writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+        await writer.drain()
+
+    async def respond(self, line, games):
+        self.requests += 1
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ProtocolError("Se esperaba un objeto JSON")
+            request_id = request.get("id")
+            handler = getattr(self, f"op_{request.get('op')}", None)
+            if handler is None:
+                raise ProtocolError(f"Operación desconocida: {request.get('op')}")
+            response = await handler(request, games)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            response = {"ok": False, "error": "JSON inválido"}
+        except ProtocolError as error:
+            response = {"ok": False, "error": str(error)}
+        except TypeError:
+            response = {"ok": False, "error": "Solicitud inválida"}
+        if request_id is not None:
+            response["id"] = request_id
+        return response
+
+    def game_id(self, request, games):
+        game_id = request.get("game")
+        if not is_int(game_id) or game_id not in games:
+            raise ProtocolError("Partida desconocida")
+        return game_id
+
+    def cell(self, request, handle):
+        row, col = request.get("row"), request.get("col")
+        if not is_int(row) or not is_int(col) or not (0 <= row < handle.rows and 0 <= col < handle.cols):
+            raise ProtocolError("Celda fuera del tablero")
+        return row, col
+
+    async def op_new(self, request, games):
+        if len(games) >= self.max_games:
+            raise ProtocolError(f"Máximo {self.max_games} partidas por conexión")
+        default_rows, default_cols, default_mines = PRESETS["principiante"]
+        rows, cols, mines = (request.get("rows", default_rows), request.get("cols", default_cols),
+                             request.get("mines", default_mines))
+        seed = request.get("seed")
+        if not all(is_int(value) for value in (rows, cols, mines)) or not (
+                2 <= rows <= MAX_BOARD_SIZE and 2 <= cols <= MAX_BOARD_SIZE):
+            raise ProtocolError(f"Tablero inválido: filas y columnas entre 2 y {MAX_BOARD_SIZE}")
+        if seed is not None and not is_int(seed):
+            raise ProtocolError("La semilla debe ser un entero")
+
+        game_id = self.next_game
+        self.next_game += 1
+        mines = max(1, min(rows * cols - 1, mines))
+        hints = bool(request.get("hints", True))
+        await self.call(game_id, new_session, rows, cols, mines, seed, hints, self.ai_options)
+        games[game_id] = GameHandle(rows, cols, hints)
+        self.active_games += 1
+        return {"ok": True, "game": game_id, "rows": rows, "cols": cols, "mines": mines}
+
+    async def op_reveal(self, request, games):
+        game_id = self.game_id(request, games)
+        row, col = self.cell(request, games[game_id])
+        revealed, over, won = await self.call(game_id, reveal, row, col)
+        return {"ok": True, "revealed": revealed, "over": over, "won": won}
+
+    async def op_flag(self, request, games):
+        game_id = self.game_id(request, games)
+        row, col = self.cell(request, games[game_id])
+        return {"ok": True, "flagged": await self.call(game_id, flag, row, col)}
+
+    async def op_hint(self, request, games):
+        game_id = self.game_id(request, games)
+        if not games[game_id].hints:
+            raise ProtocolError("Esta partida no tiene pistas")
+        start = time.perf_counter()
+        move, guess, mines = await self.call(game_id, hint)
+        self.hint_time += time.perf_counter() - start
+        self.hints += 1
+        return {"ok": True, "row": move[0], "col": move[1], "guess": guess, "mines": mines}
+
+    async def op_state(self, request, games):
+        game_id = self.game_id(request, games)
+        board, over, won = await self.call(game_id, board_state)
+        return {"ok": True, "board": board, "over": over, "won": won}
+
+    async def op_close(self, request, games):
+        game_id = self.game_id(request, games)
+        del games[game_id]
+        self.active_games -= 1
+        await self.call(game_id, close_session)
+        return {"ok": True}
+
+    async def op_stats(self, request, games):
+        return {
+            "ok": True,
+            "connections": self.connections,
+            "games": self.active_games,
+            "requests": self.requests,
+            "hints": self.hints,
+            "hint_ms": 1000 * self.hint_time / self.hints if self.hints else 0.0
+        }
+
+async def serve(server, host="127.0.0.1", port=8765, unix=None):
+    if unix:
+        listener = await asyncio.start_unix_server(server.handle_connection, path=unix, limit=LINE_LIMIT)
+        print(f"Escuchando en {unix}")
+    else:
+        listener = await asyncio.start_server(server.handle_connection, host, port, limit=LINE_LIMIT)
+        print(f"Escuchando en {host}:{port}")
+    async with listener:
+        await listener.serve_forever()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de partidas de Buscaminas para bots (JSON por líneas)")
+    add_ai_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--unix", help="Escuchar en este socket Unix en lugar de TCP")
+    parser.add_argument("--procesos", type=int, help="Procesos que alojan las partidas y su inferencia")
+    parser.add_argument("--partidas-conexion", type=int, default=64, help="Partidas abiertas como máximo por conexión")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    ai_options = ai_options_from_args(args)
+    ai_options.pop("profile")
+    workers = [ProcessPoolExecutor(max_workers=1) for _ in range(args.procesos or os.cpu_count() or 1)]
+
+    server = GameServer(workers, ai_options, args.partidas_conexion)
+    try:
+        asyncio.run(serve(server, args.host, args.puerto, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for worker in workers:
+            worker.shutdown(cancel_futures=True)
+    print(f"Solicitudes: {server.requests} | Pistas: {server.hints}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import argparse
+import os
+import time
+
+from ia import MinesweeperAI
+from motor import PRESETS, MinesweeperGame
+from patrones import PatternCache
+from perfil import SolverProfile
+from repeticion import GameLog
+
+def new_game(seed, rows, cols, mines, **ai_options):
+    # Semilla distinta para el agente: si compartiera la secuencia del tablero, sus adivinanzas dependerían de las minas
+    ai = MinesweeperAI(rows, cols, seed=f"ia-{seed}", total_mines=mines, **ai_options)
+    return MinesweeperGame(rows, cols, mines, seed=seed, ai=ai)
+
+def solve(seed, rows, cols, mines, record=False, **ai_options):
+    game = new_game(seed, rows, cols, mines, **ai_options)
+    ai = game.ai
+    if record:
+        game.start_recording(GameLog())
+
+    start = time.perf_counter()
+    while not game.game_over and not game.game_won:
+        if game.ai_step() is None:
+            break
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "seed": seed,
+        "rows": rows,
+        "cols": cols,
+        "mines": mines,
+        "won": game.game_won,
+        "moves": game.ai_moves,
+        "guesses": game.ai_guesses,
+        "revealed": game.cells_revealed,
+        "time": elapsed
+    }
+    if ai.profile is not None:
+        result["profile"] = ai.profile.to_dict()
+    if record:
+        result["replay"] = game.log.to_bytes()
+    return result
+
+def run_games(rows, cols, mines, games, seed=0, **ai_options):
+    return [solve(seed + i, rows, cols, mines, **ai_options) for i in range(games)]
+
+def save_replays(results, directory, slow=None):
+    # Guarda las partidas perdidas y las más lentas que "slow" segundos; las demás se descartan
+    os.makedirs(directory, exist_ok=True)
+    saved = 0
+    for result in results:
+        replay = result.pop("replay")
+        if not result["won"] or (slow is not None and result["time"] > slow):
+            with open(os.path.join(directory, f"partida-{result['seed']}.bmr"), "wb") as f:
+                f.write(replay)
+            saved += 1
+    return saved
+
+def add_board_arguments(parser):
+    parser.add_argument("--nivel", choices=sorted(PRESETS), default="principiante")
+    parser.add_argument("--filas", type=int, help="Filas del tablero personalizado")
+    parser.add_argument("--columnas", type=int, help="Columnas del tablero personalizado")
+    parser.add_argument("--minas", type=int, help="Minas del tablero personalizado")
+    parser.add_argument("--partidas", type=int, default=1000)
+    parser.add_argument("--semilla", type=int, default=0)
+
+def add_ai_arguments(parser):
+    parser.add_argument("--bitboard", action="store_true", help="Representar las sentencias como máscaras de bits")
+    parser.add_argument("--inferencia", choices=["rules", "linear", "sat"], default="rules",
+                        help="Reglas de subconjuntos, eliminación gaussiana o búsqueda completa de restricciones")
+    parser.add_argument("--conflictos", type=int, default=2000,
+                        help="Conflictos máximos por jugada en la búsqueda de restricciones")
+    parser.add_argument("--adivinanza", choices=["probability", "random"], default="probability",
+                        help="Cómo elegir la celda cuando no hay movimientos seguros")
+    parser.add_argument("--recoleccion", action="store_true",
+                        help="Quitar las sentencias implicadas por otras más pequeñas: ahorra memoria pero puede "
+                             "perder deducciones")
+    parser.add_argument("--limite-conocimiento", type=int,
+                        help="Máximo de sentencias; al superarlo se desalojan primero las derivadas más antiguas")
+    parser.add_argument("--perfil", help="Medir las fases del agente y guardar el perfil del lote en este archivo JSON")
+    parser.add_argument("--presupuesto", type=float, default=0.1,
+                        help="Segundos máximos para calcular probabilidades antes de adivinar al azar")
+
+def ai_options_from_args(args):
+    return {
+        "bitboard": args.bitboard,
+        "inference": args.inferencia,
+        "conflict_budget": args.conflictos,
+        "guess": args.adivinanza,
+        "guess_budget": args.presupuesto,
+        "knowledge_gc": args.recoleccion,
+        "knowledge_limit": args.limite_conocimiento,
+        "profile": bool(args.perfil)
+    }
+
+def save_profile(results, path):
+    profile = SolverProfile()
+    for result in results:
+        profile.merge(result["profile"])
+    profile.save(path)
+    return profile
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulación sin interfaz del agente de Buscaminas")
+    add_board_arguments(parser)
+    add_ai_arguments(parser)
+    parser.add_argument("--repeticiones", help="Guardar en esta carpeta las repeticiones de las partidas perdidas")
+    parser.add_argument("--patrones",
+                        help="Caché de patrones locales: se carga de este archivo JSON si existe y se guarda al terminar")
+    parser.add_argument("--lenta", type=float,
+                        help="Guardar también las repeticiones de las partidas que tarden más de estos segundos")
+    return parser.parse_args(argv)
+
+def board_from_args(args):
+    rows, cols, mines = PRESETS[args.nivel]
+    if args.filas is not None:
+        rows = args.filas
+    if args.columnas is not None:
+        cols = args.columnas
+    if args.minas is not None:
+        mines = args.minas
+    return rows, cols, max(1, min(rows * cols - 1, mines))
+
+def main(argv=None):
+    args = parse_args(argv)
+    rows, cols, mines = board_from_args(args)
+
+    ai_options = ai_options_from_args(args)
+    if args.patrones:
+        ai_options["patterns"] = PatternCache(args.patrones)
+
+    start = time.perf_counter()
+    results = run_games(rows, cols, mines, args.partidas, args.semilla, record=bool(args.repeticiones), **ai_options)
+    elapsed = time.perf_counter() - start
+
+    wins = sum(1 for r in results if r["won"])
+    print(f"Tablero: {rows}x{cols}, {mines} minas")
+    print(f"Partidas: {len(results)} | Victorias: {wins} ({100 * wins / max(1, len(results)):.1f}%)")
+    print(f"Tiempo: {elapsed:.2f}s ({len(results) / max(elapsed, 1e-9):.1f} partidas/s)")
+
+    if args.perfil:
+        save_profile(results, args.perfil)
+    if args.patrones:
+        patterns = ai_options["patterns"]
+        patterns.save()
+        print(f"Patrones: {len(patterns)} guardados | aciertos {100 * patterns.hit_rate():.1f}%")
+    if args.repeticiones:
+        saved = save_replays(results, args.repeticiones, args.lenta)
+        print(f"Repeticiones guardadas: {saved} en {args.repeticiones}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import contextlib
+import io
+import unittest
+
+from rendimiento import TIMED_METRICS, compare, run_suite
+
+SCENARIOS = [
+    ("principiante", 9, 9, 10),
+    ("16x16 25%", 16, 16, 64)
+]
+
+def suite():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run_suite(10, seed=0, memory_games=1, scenarios=SCENARIOS, rounds=5)
+
+def quiet_compare(baseline, current, tolerance=0.20):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return compare(baseline, current, tolerance)
+
+def scaled(results, factor):
+    # Copia de los resultados con todos los tiempos multiplicados por factor
+    scenarios = {}
+    for name, result in results["scenarios"].items():
+        result = dict(result, rounds={metric: [factor * value for value in values]
+                                      for metric, values in result["rounds"].items()})
+        for metric in TIMED_METRICS:
+            result[metric] *= factor
+        scenarios[name] = result
+    return dict(results, scenarios=scenarios)
+
+class CompareTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.baseline = suite()
+
+    def test_run_against_itself(self):
+        self.assertEqual(quiet_compare(self.baseline, self.baseline), [])
+
+    def test_overlapping_rounds(self):
+        # La mediana empeora más que la tolerancia, pero una ronda actual es tan rápida como la base
+        current = scaled(self.baseline, 1.5)
+        for name, result in current["scenarios"].items():
+            result["rounds"]["solve_ms_mean"][0] = min(self.baseline["scenarios"][name]["rounds"]["solve_ms_mean"])
+        regressions = quiet_compare(self.baseline, current)
+        self.assertNotIn(("principiante", "solve_ms_mean"), regressions)
+
+    def test_slower_run(self):
+        regressions = quiet_compare(self.baseline, scaled(self.baseline, 3.0))
+        self.assertIn(("principiante", "solve_ms_mean"), regressions)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import argparse
+import json
+import math
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from simulador import add_ai_arguments, add_board_arguments, ai_options_from_args, board_from_args, save_profile, solve
+
+Z_95 = 1.959963984540054
+
+def play_shard(shard):
+    rows, cols, mines, seeds, ai_options = shard
+    return [solve(seed, rows, cols, mines, **ai_options) for seed in seeds]
+
+def shard_seeds(seed, games, chunk_size):
+    end = seed + games
+    return [range(start, min(end, start + chunk_size)) for start in range(seed, end, chunk_size)]
+
+def run_tournament(rows, cols, mines, games, seed=0, workers=None, chunk_size=None, **ai_options):
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        # Bloques pequeños reparten mejor la carga, bloques grandes reducen el costo de comunicación
+        chunk_size = max(1, min(500, games // (workers * 8)))
+
+    shards = [(rows, cols, mines, seeds, ai_options) for seeds in shard_seeds(seed, games, chunk_size)]
+
+    results = []
+    if workers == 1:
+        for shard in shards:
+            results.extend(play_shard(shard))
+    else:
+        # map conserva el orden de los bloques, así el resultado no depende del número de procesos
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for shard_results in pool.map(play_shard, shards):
+                results.extend(shard_results)
+    return results
+
+def wilson_interval(successes, n, z=Z_95):
+    if n == 0:
+        return 0.0, 0.0
+    p = successes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    # En los extremos center - half (o center + half) da 0 (o 1) salvo por redondeo
+    low = 0.0 if successes == 0 else max(0.0, center - half)
+    high = 1.0 if successes == n else min(1.0, center + half)
+    return low, high
+
+def mean_interval(values, z=Z_95):
+    if not values:
+        return 0.0, 0.0, 0.0
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, mean, mean
+    half = z * statistics.stdev(values) / math.sqrt(len(values))
+    return mean, mean - half, mean + half
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, math.ceil(q / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+def describe(values):
+    mean, low, high = mean_interval(values)
+    return {
+        "mean": mean,
+        "ci95": [low, high],
+        "p50": percentile(values, 50),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else 0.0
+    }
+
+def summarize(results):
+    games = len(results)
+    wins = sum(1 for r in results if r["won"])
+    low, high = wilson_interval(wins, games)
+    return {
+        "games": games,
+        "wins": wins,
+        "win_rate": wins / games if games else 0.0,
+        "win_rate_ci95": [low, high],
+        "moves": describe([r["moves"] for r in results]),
+        "guesses": describe([r["guesses"] for r in results]),
+        "time": describe([r["time"] for r in results])
+    }
+
+def print_summary(summary, rows, cols, mines, elapsed):
+    win_low, win_high = summary["win_rate_ci95"]
+    print(f"Tablero: {rows}x{cols}, {mines} minas")
+    print(f"Partidas: {summary['games']} | Victorias: {summary['wins']} "
+          f"({100 * summary['win_rate']:.2f}%, IC95 {100 * win_low:.2f}%-{100 * win_high:.2f}%)")
+    for label, key in (("Movimientos", "moves"), ("Adivinanzas", "guesses")):
+        stats = summary[key]
+        print(f"{label}: media {stats['mean']:.2f} (IC95 {stats['ci95'][0]:.2f}-{stats['ci95'][1]:.2f})")
+    stats = summary["time"]
+    print(f"Tiempo por partida: media {1000 * stats['mean']:.2f}ms | p50 {1000 * stats['p50']:.2f}ms | "
+          f"p99 {1000 * stats['p99']:.2f}ms | máx {1000 * stats['max']:.2f}ms")
+    print(f"Tiempo total: {elapsed:.2f}s ({summary['games'] / max(elapsed, 1e-9):.1f} partidas/s)")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Torneo multiproceso del agente de Buscaminas")
+    add_board_arguments(parser)
+    add_ai_arguments(parser)
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos a usar (por defecto todos los núcleos)")
+    parser.add_argument("--bloque", type=int, default=None, help="Partidas por bloque enviado a cada proceso")
+    parser.add_argument("--json", dest="json_path", help="Archivo donde guardar el resumen")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    rows, cols, mines = board_from_args(args)
+
+    start = time.perf_counter()
+    results = run_tournament(rows, cols, mines, args.partidas, args.semilla, args.procesos, args.bloque,
+                             **ai_options_from_args(args))
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    print_summary(summary, rows, cols, mines, elapsed)
+
+    if args.perfil:
+        save_profile(results, args.perfil)
+
+    if args.json_path:
+        summary.update({"rows": rows, "cols": cols, "mines": mines, "seed": args.semilla})
+        with open(args.json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+
+if __name__ == "__main__":
+    main()
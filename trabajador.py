@@ -0,0 +1,41 @@
+import queue
+import threading
+
+class AIWorker:
+    def __init__(self):
+        self.requests = queue.Queue()
+        self.responses = queue.Queue()
+        # Cada partida nueva cambia la generación; las respuestas de partidas anteriores se descartan
+        self.generation = 0
+        self.busy = False
+        self.thread = threading.Thread(target=self.loop, daemon=True)
+        self.thread.start()
+
+    def submit(self, ai, observations):
+        self.busy = True
+        self.requests.put((self.generation, ai, observations))
+
+    def cancel(self):
+        self.generation += 1
+        self.busy = False
+
+    def poll(self):
+        while True:
+            try:
+                generation, result = self.responses.get_nowait()
+            except queue.Empty:
+                return None
+            if generation == self.generation:
+                self.busy = False
+                return result
+
+    def loop(self):
+        while True:
+            generation, ai, observations = self.requests.get()
+            if generation != self.generation:
+                continue
+
+            if observations:
+                ai.add_knowledge_many(observations)
+            move, guess = ai.choose_move()
+            self.responses.put((generation, (move, guess, ai.summary())))